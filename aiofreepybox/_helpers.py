@@ -0,0 +1,172 @@
+from abc import ABC, abstractmethod
+from array import array
+import asyncio
+import logging
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from aiohttp import ClientError
+
+from aiofreepybox.exceptions import HttpRequestError
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def bounded_gather(aws: Iterable[Awaitable[T]], concurrency: int) -> List[T]:
+    """
+    Await aws like ``asyncio.gather`` with at most concurrency of them
+    pending at once
+
+    aws : `iterable` of awaitables
+    concurrency : `int`, max pending awaitables
+
+    Returns the results in the order of aws
+    """
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return list(await asyncio.gather(*[run(aw) for aw in aws]))
+
+
+class Poller(ABC):
+    """
+    Base class of the periodic pollers
+
+    Subclasses implement ``poll`` and pass the changes it finds to
+    ``notify``. ``run`` polls every ``interval`` until cancelled, the
+    interval may be changed by ``poll``.
+
+    name : `str`, used in log messages
+    interval : `float`
+    """
+
+    def __init__(self, name: str, interval: float) -> None:
+        self.name = name
+        self.interval = interval
+        self._subscribers: List[Callable[[Any], Any]] = []
+
+    def subscribe(self, callback: Callable[[Any], Any]) -> Callable[[], None]:
+        """
+        Call callback with the changes after each poll,
+        callback may be a coroutine function
+
+        callback : `callable`
+
+        Returns a function removing the subscription
+        """
+
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    async def notify(self, changes: Any) -> None:
+        """
+        Call the subscribers with changes, a failing subscriber is logged
+        and does not prevent the others from being called
+
+        changes : `list`
+        """
+
+        for callback in list(self._subscribers):
+            try:
+                r = callback(changes)
+                if asyncio.iscoroutine(r):
+                    await r
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                _LOGGER.exception(f"{self.name} subscriber {callback!r} failed")
+
+    @abstractmethod
+    async def poll(self) -> Any:
+        """
+        Poll once
+        """
+
+    async def run(self) -> None:
+        """
+        Poll until cancelled
+        """
+
+        loop = asyncio.get_event_loop()
+        while True:
+            start = loop.time()
+            try:
+                await self.poll()
+            except (ClientError, HttpRequestError) as e:
+                self._poll_failed(e)
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - start)))
+
+    def _poll_failed(self, e: Exception) -> None:
+        """Called when a poll request failed"""
+        _LOGGER.warning(f"{self.name} poll failed: {str(e)}")
+
+
+class RingSeries:
+    """
+    Preallocated ring buffers of samples sharing one write position,
+    the oldest sample is overwritten once size samples were appended
+
+    names : `list` of `str`, series names
+    size : `int`
+    typecodes : `dict`, array typecode by name, optional
+        , Default to "d" for every series
+    """
+
+    __slots__ = ("size", "count", "_arrays")
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        size: int,
+        typecodes: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.size = max(1, size)
+        self.count = 0
+        self._arrays: Dict[str, array] = {}
+        for name in names:
+            typecode = (typecodes or {}).get(name, "d")
+            itemsize = array(typecode).itemsize
+            self._arrays[name] = array(typecode, bytes(itemsize * self.size))
+
+    def __len__(self) -> int:
+        return min(self.count, self.size)
+
+    def append(self, values: Mapping[str, Any]) -> None:
+        """
+        Write one sample of every series
+
+        values : `dict`, value by series name
+        """
+
+        slot = self.count % self.size
+        for name, a in self._arrays.items():
+            a[slot] = values[name]
+        self.count += 1
+
+    def samples(self) -> Dict[str, List[Any]]:
+        """
+        Return the samples of every series, oldest first
+        """
+
+        start = self.count % self.size if self.count > self.size else 0
+        if start:
+            return {
+                k: (a[start:] + a[:start]).tolist() for k, a in self._arrays.items()
+            }
+        return {k: a[: self.count].tolist() for k, a in self._arrays.items()}
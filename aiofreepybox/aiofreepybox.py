@@ -1,23 +1,34 @@
 import asyncio
-import base64
-import bz2
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from functools import lru_cache
 from importlib import import_module
-from importlib import resources
 import ipaddress
 import json
 import logging
-from os import fspath
 from pathlib import Path
-import pkgutil
 import socket
 import ssl
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import urljoin
 
 import aiohttp
 
 import aiofreepybox
 from aiofreepybox.access import Access
+from aiofreepybox.api._registry import API_MODULES
+from aiofreepybox.authorization import Authorization
 from aiofreepybox.exceptions import (
     AuthorizationError,
     HttpRequestError,
@@ -25,6 +36,8 @@ from aiofreepybox.exceptions import (
     InvalidTokenError,
     NotOpenError,
 )
+from aiofreepybox.mdns import FBX_API_SERVICE, MdnsBrowser
+from aiofreepybox.store import FileStore, Store, STORE_DB, STORE_TOKEN
 
 # API modules extra parameters
 _API_MODS_PARAMS: Dict[str, Any] = {}  # {"player": {"api_version": "v6"}}
@@ -42,21 +55,37 @@ _SELF_DIR = Path(__file__).parent
 # App defaults
 _DEFAULT_API_VERSION = "v6"
 _DEFAULT_CERT = "freebox_certificates.pem"
+_DEFAULT_CLOSE_TIMEOUT = 1
+_DEFAULT_DB_WRITE_DELAY = 0.5
 _DEFAULT_DEVICE_TYPE = "FreeboxServer"
+_DEFAULT_DISC_TIMEOUT = 1.0
+_DEFAULT_DISC_WORKERS = 64
 _DEFAULT_ERR = "Error: "
 _DEFAULT_HOST = "mafreebox.freebox.fr"
 _DEFAULT_HTTP_PORT = "80"
 _DEFAULT_HTTPS_PORT = "443"
+_DEFAULT_MDNS_TIMEOUT = 2.0
 _DEFAULT_SSL = True
 _DEFAULT_TIMEOUT = 10
 _DEFAULT_UNKNOWN = "None"
+_DEFAULT_WARMUP = 4
 _LOGGER = logging.getLogger(__name__)
 
-# Db file prefix
-_F_DB_NAME = ".fbx_db"
+# Single worker, db and token writes are applied in submission order
+_IO_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aiofreepybox")
+
 
-# Token file prefix
-_F_TOKEN_NAME = ".fbx_app_auth"
+@lru_cache(maxsize=None)
+def _ssl_context(cert_path: str) -> ssl.SSLContext:
+    """
+    Return the SSL context trusting cert_path, loaded once per path
+
+    cert_path : `str`
+    """
+
+    ssl_ctx = ssl.create_default_context()
+    ssl_ctx.load_verify_locations(cafile=cert_path)
+    return ssl_ctx
 
 
 class Freepybox:
@@ -73,6 +102,21 @@ class Freepybox:
         , Default to _SELF_DIR
     timeout : `int` , optional
         , Default to _DEFAULT_TIMEOUT
+    store : `Store`, token and db storage backend, optional
+        , Default to FileStore(data_dir)
+    auth_callback : `callable`, called with the `Authorization` flow when
+        the user must confirm access on the freebox, optional
+        , Default to a log warning
+    auth_options : `dict`, `Authorization` polling options
+        (interval, max_interval, deadline), optional
+        , Default to None
+    connector_options : `dict`, `aiohttp.TCPConnector` options (limit,
+        limit_per_host, keepalive_timeout, ttl_dns_cache...), optional
+        , Default to None
+    session : `aiohttp.ClientSession`, caller session used for freebox
+        requests and left open on close, its connector must trust
+        `fbx_ssl_context` for HTTPS, optional
+        , Default to None
     """
 
     def __init__(
@@ -81,29 +125,34 @@ class Freepybox:
         api_version: Optional[str] = None,
         data_dir: Optional[str] = None,
         timeout: Optional[int] = None,
+        store: Optional[Store] = None,
+        auth_callback: Optional[Callable[[Authorization], Any]] = None,
+        auth_options: Optional[Dict[str, float]] = None,
+        connector_options: Optional[Dict[str, Any]] = None,
+        session: Optional[aiohttp.ClientSession] = None,
     ) -> None:
         self.api_version: str = api_version or _DEFAULT_API_VERSION
         self.app_desc: Dict[str, str] = app_desc if app_desc is not None else _APP_DESC
         self.data_dir: Path = Path(data_dir) if data_dir is not None else _SELF_DIR
         self.timeout: int = timeout if timeout is not None else _DEFAULT_TIMEOUT
+        self.store: Store = store if store is not None else FileStore(self.data_dir)
+        self.auth_callback = auth_callback
+        self.auth_options: Dict[str, float] = auth_options or {}
+        self.authorization: Optional[Authorization] = None
+        self.connector_options: Dict[str, Any] = connector_options or {}
+        self.mdns = MdnsBrowser()
         self._access: Optional[Access] = None
+        self._db_pending: Dict[str, asyncio.Handle] = {}
+        self._db_writes: Set[asyncio.Future] = set()
         self._fbx_db: Dict[str, Any] = {}
         self._fbx_uid: str = ""
+        self._ext_session = session
         self._session: Optional[aiohttp.ClientSession] = None
 
     def __imp_api__(self, api_l: List[str]) -> Dict[str, Any]:
         """ Import API modules """
 
-        l = len(api_l)
-        api_l = list(
-            filter(
-                lambda n: resources.is_resource(
-                    __name__.rsplit(".", 1)[0] + ".api", str(n) + ".py"
-                ),
-                api_l,
-            )
-        )
-        if len(api_l) != l:
+        if not all(n in API_MODULES for n in api_l):
             raise KeyError
 
         mods = {
@@ -112,6 +161,14 @@ class Freepybox:
         }
         return mods
 
+    async def __aenter__(self) -> "Freepybox":
+        """ Enter async context, the session is closed on exit """
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """ Exit async context """
+        await self.close()
+
     def __getattr__(self, k):
         """ Return API attribute """
 
@@ -129,10 +186,10 @@ class Freepybox:
                 if k in _API_MODS_PARAMS and isinstance(_API_MODS_PARAMS[k], dict):
                     kwargs = _API_MODS_PARAMS[k]
                 setattr(
-                    self, k, getattr(mod[k], k.capitalize())(self._access, **kwargs)
+                    self, k, getattr(mod[k], API_MODULES[k])(self._access, **kwargs)
                 )
             else:
-                return getattr(mod[k], k.capitalize())
+                return getattr(mod[k], API_MODULES[k])
 
         return getattr(self, k)
 
@@ -147,27 +204,12 @@ class Freepybox:
         """
 
         if uids is None:
-            uids = [
-                base64.b64decode(x.name.rsplit("_", 1)[1]).decode("utf-8")
-                for x in Path(self.data_dir).glob(_F_DB_NAME + "_*")
-            ]
-        auth = [
-            base64.b64decode(x.name.rsplit("_", 1)[1]).decode("utf-8")
-            for x in Path(self.data_dir).glob(_F_TOKEN_NAME + "_*")
-        ]
+            uids = self.store.uids(STORE_DB)
+        auth = set(self.store.uids(STORE_TOKEN))
         c = 0
         for uid in uids:
-            if uid not in auth or all_:
-                fname = Path(self.data_dir).joinpath(
-                    _F_DB_NAME
-                    + "_"
-                    + base64.b64encode(uid.encode("utf-8")).decode("utf-8")
-                )
-                try:
-                    fname.unlink()
-                    c += 1
-                except FileNotFoundError:
-                    pass
+            if (uid not in auth or all_) and self.store.delete(STORE_DB, uid):
+                c += 1
         if c != 0:
             _LOGGER.debug(f"{c} db entry cleared")
             return True
@@ -178,6 +220,7 @@ class Freepybox:
         Close the freebox session
         """
 
+        await self._fbx_flush_db()
         if self._session and self._session.closed:  # type: ignore # noqa
             return None
 
@@ -185,11 +228,8 @@ class Freepybox:
             await self._access.post("login/logout")  # type: ignore # noqa
         except AttributeError:
             pass
-        try:
-            await self._session.close()  # type: ignore # noqa
-            await asyncio.sleep(0.250)
-        except AttributeError:
-            pass
+        if self._session is not None:
+            await self._close_session(self._session)
 
     async def discover(
         self, host: Optional[str] = None, port: Optional[Union[int, str]] = None
@@ -218,7 +258,8 @@ class Freepybox:
         # Found freebox ?
         fbx_desc: Dict[str, Any] = {}
         try:
-            async with self._fbx_open_session(**fbx_addict) as session:
+            session = self._fbx_open_session(**fbx_addict)
+            try:
                 async with session.get(  # type: ignore # noqa
                     f"http{fbx_addict['s']}://{fbx_addict['host']}:{fbx_addict['port']}"
                     "/api_version",
@@ -228,6 +269,8 @@ class Freepybox:
                     if r.content_type != "application/json":
                         raise ValueError(f"Invalid content type: {r.content_type}")
                     fbx_desc = await r.json()
+            finally:
+                await self._close_session(session)
         except asyncio.TimeoutError:
             raise ValueError(f"{_DEFAULT_ERR}Timeout")
         except (
@@ -247,6 +290,120 @@ class Freepybox:
         uid = self._fbx_update_db(fbx_desc, fbx_addict)
         return self._fbx_db[uid]["desc"]
 
+    async def discover_many(
+        self,
+        networks: Iterable[str],
+        ports: Optional[Iterable[Union[int, str]]] = None,
+        workers: int = _DEFAULT_DISC_WORKERS,
+        timeout: float = _DEFAULT_DISC_TIMEOUT,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Discover freeboxes on IPv4 network ranges
+
+        Every host and port is probed concurrently, each connection found
+        is added to the db and the description of each freebox is yielded
+        once, even if it answers on several addresses or ports.
+
+        networks : `list`, CIDR ranges or addresses
+        ports : `list` , optional
+            , Default to [_DEFAULT_HTTP_PORT]
+        workers : `int` , optional
+            , Default to _DEFAULT_DISC_WORKERS
+        timeout : `float` , optional
+            , Default to _DEFAULT_DISC_TIMEOUT
+        """
+
+        nets = [ipaddress.ip_network(n, strict=False) for n in networks]
+        for net in nets:
+            if net.version == 6:
+                raise ValueError(f"{_DEFAULT_ERR}{net} : IPv6 is not supported")
+        ports_l = [str(p) for p in ports] if ports else [_DEFAULT_HTTP_PORT]
+
+        jobs: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        found: asyncio.Queue = asyncio.Queue()
+
+        async def _produce() -> None:
+            for net in nets:
+                # /31 and /32 have no network and broadcast addresses
+                for ip in net.hosts() if net.num_addresses > 2 else net:
+                    for port in ports_l:
+                        await jobs.put(self._disc_s_host_port(str(ip), port))
+            for _ in range(workers):
+                await jobs.put(None)
+
+        async def _probe(session: aiohttp.ClientSession) -> None:
+            try:
+                while True:
+                    fbx_addict = await jobs.get()
+                    if fbx_addict is None:
+                        break
+                    try:
+                        async with session.get(
+                            f"http{fbx_addict['s']}://{fbx_addict['host']}"
+                            f":{fbx_addict['port']}/api_version",
+                            timeout=timeout,
+                            skip_auto_headers=["User-Agent"],
+                        ) as r:
+                            fbx_desc = await r.json()
+                    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                        continue
+                    if isinstance(fbx_desc, dict) and _DEFAULT_DEVICE_TYPE in str(
+                        fbx_desc.get("device_type")
+                    ):
+                        await found.put((fbx_desc, fbx_addict))
+            finally:
+                await found.put(None)
+
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                ssl=self.fbx_ssl_context, limit=workers, force_close=True
+            )
+        )
+        tasks = [asyncio.ensure_future(_produce())]
+        tasks += [asyncio.ensure_future(_probe(session)) for _ in range(workers)]
+        seen: Set[str] = set()
+        try:
+            running = workers
+            while running:
+                item = await found.get()
+                if item is None:
+                    running -= 1
+                    continue
+                uid = self._fbx_update_db(*item)
+                if uid not in seen:
+                    seen.add(uid)
+                    yield self._fbx_db[uid]["desc"]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._close_session(session)
+
+    async def discover_mdns(
+        self, timeout: float = _DEFAULT_MDNS_TIMEOUT
+    ) -> List[Dict[str, Any]]:
+        """
+        Discover freeboxes advertising their API with mDNS
+
+        Descriptions are read from the TXT records without HTTP requests,
+        and added to the db so that `open` can be called with their uid.
+        Answers are cached for their advertised TTL.
+
+        timeout : `float` , optional
+            , Default to _DEFAULT_MDNS_TIMEOUT
+        """
+
+        descs = []
+        for svc in await self.mdns.browse(FBX_API_SERVICE, timeout):
+            fbx_desc = svc.fbx_desc()
+            if _DEFAULT_DEVICE_TYPE not in svc.device_type or "uid" not in fbx_desc:
+                continue
+            uid = self._fbx_update_db(
+                fbx_desc, self._disc_s_host_port(svc.host, str(svc.port))
+            )
+            descs.append(self._fbx_db[uid]["desc"])
+        return descs
+
     def get_db(
         self, uids: Optional[List[str]] = None
     ) -> Optional[List[Dict[str, Any]]]:
@@ -259,15 +416,12 @@ class Freepybox:
 
         fbx_db = []
         if uids is None:
-            uids = [
-                base64.b64decode(x.name.rsplit("_", 1)[1]).decode("utf-8")
-                for x in Path(self.data_dir).glob(_F_DB_NAME + "_*")
-            ]
+            uids = self.store.uids(STORE_DB)
         for uid in uids:
             try:
                 fbx_db.append({uid: self._fbx_db[uid]})
             except KeyError:
-                d = self._readfile_fbx_db(Path(self.data_dir), uid)
+                d = self._read_fbx_db(uid)
                 if d is not None:
                     fbx_db.append({uid: d})
 
@@ -295,6 +449,32 @@ class Freepybox:
             return await self._access.get_permissions()
         return None
 
+    async def preload(self, api_l: Optional[List[str]] = None) -> None:
+        """
+        Import API modules in a worker thread, so that the first access
+        to them does not block the event loop
+
+        api_l : `list`, optional
+            , Default to all API modules
+        """
+
+        await asyncio.get_event_loop().run_in_executor(
+            None, self.__imp_api__, list(API_MODULES) if api_l is None else api_l
+        )
+
+    async def read_store(self, kind: str, uid: str) -> Optional[Dict[str, Any]]:
+        """
+        Read a store entry in the store writer thread, after the pending
+        writes
+
+        kind : `str`
+        uid : `str`
+        """
+
+        return await asyncio.get_event_loop().run_in_executor(
+            _IO_EXECUTOR, self.store.read, kind, uid
+        )
+
     async def open(
         self,
         host: Optional[str] = None,
@@ -328,23 +508,81 @@ class Freepybox:
             raise
 
         try:
-            self._access = await self._get_app_access(
-                uid, Path(self.data_dir), self.app_desc, self.timeout
-            )
+            self._access = await self._get_app_access(uid, self.app_desc, self.timeout)
         except AuthorizationError:
             _LOGGER.error("Authorization error")
             raise
 
         self._fbx_uid = uid
 
+    async def warmup(self, n: int = _DEFAULT_WARMUP) -> int:
+        """
+        Pre-establish keep-alive connections to the freebox
+
+        n : `int`, number of concurrent connections, capped by the
+            connector limits
+            , Default to _DEFAULT_WARMUP
+
+        Returns the number of successful requests
+        """
+
+        if self._session is None or self._session.closed:
+            raise NotOpenError(f"{_DEFAULT_ERR}Session is not open")
+
+        async def _warm() -> None:
+            async with self._session.get(  # type: ignore # noqa
+                urljoin(self.fbx_url, "api_version"),  # type: ignore # noqa
+                timeout=self.timeout,
+                skip_auto_headers=["User-Agent"],
+            ) as r:
+                await r.read()
+
+        res = await asyncio.gather(*[_warm() for _ in range(n)], return_exceptions=True)
+        return sum(1 for r in res if not isinstance(r, BaseException))
+
+    async def write_store(self, kind: str, uid: str, entry: Dict[str, Any]) -> str:
+        """
+        Write a store entry in the store writer thread, entries are
+        written in submission order
+
+        kind : `str`
+        uid : `str`
+        entry : `dict`
+        """
+
+        return await asyncio.get_event_loop().run_in_executor(
+            _IO_EXECUTOR, self.store.write, kind, uid, entry
+        )
+
     def _api_mods_l(self) -> List[str]:
         """ Return mods list """
-        return list(
-            map(
-                lambda t: t[1],
-                pkgutil.iter_modules([str(Path(_SELF_DIR).joinpath("api"))]),
-            )
-        )
+        return list(API_MODULES)
+
+    async def _close_session(
+        self, session: aiohttp.ClientSession, timeout: float = _DEFAULT_CLOSE_TIMEOUT
+    ) -> None:
+        """
+        Close session and wait for its transports to be closed
+
+        session : `aiohttp.ClientSession`
+        timeout : `float`
+            , Default to _DEFAULT_CLOSE_TIMEOUT
+        """
+
+        if session is self._ext_session:
+            return
+
+        waiters = []
+        if session.connector is not None:
+            for conns in list(session.connector._conns.values()):  # type: ignore # noqa
+                waiters += [self._transport_closed(proto) for proto, _ in conns]
+        await session.close()
+        if waiters:
+            _, pending = await asyncio.wait(waiters, timeout=timeout)
+            if pending:
+                _LOGGER.debug(
+                    f"{len(pending)} transport(s) not closed after {timeout}s"
+                )
 
     async def _disc_c_session(self, fbx_addict: Dict[str, Any]) -> Dict[str, Any]:
         """Check discovery session"""
@@ -361,11 +599,7 @@ class Freepybox:
                 and c.is_ssl == (not not fbx_addict["s"])
             ):
                 raise KeyError(self._fbx_db[self._fbx_uid]["desc"])
-            try:
-                await self._session.close()  # type: ignore # noqa
-                await asyncio.sleep(0.250)
-            except AttributeError:
-                pass
+            await self._close_session(self._session)
 
         return fbx_addict
 
@@ -441,7 +675,11 @@ class Freepybox:
     async def _fbx_open_db(self, uid: str) -> str:
         """Open freebox db"""
 
-        db = self._readfile_fbx_db(Path(self.data_dir), uid)
+        db = (
+            self._fbx_db[uid]
+            if uid in self._fbx_db
+            else await self.read_store(STORE_DB, uid)
+        )
         try:
             if db is None:
                 fbx_desc = await self.discover()
@@ -499,15 +737,17 @@ class Freepybox:
             _LOGGER.error("Cannot open freebox port")
             raise
 
+        if self._ext_session is not None:
+            return self._ext_session
+
         # Connect session
         try:
             if s == "s":
-                cert_path = str(Path(_SELF_DIR).joinpath(_DEFAULT_CERT))
-                ssl_ctx = ssl.create_default_context()
-                ssl_ctx.load_verify_locations(cafile=cert_path)
-                conn = aiohttp.TCPConnector(ssl_context=ssl_ctx)
+                conn = aiohttp.TCPConnector(
+                    ssl=self.fbx_ssl_context, **self.connector_options
+                )
             else:
-                conn = aiohttp.TCPConnector()
+                conn = aiohttp.TCPConnector(**self.connector_options)
             session = aiohttp.ClientSession(connector=conn)
         except ssl.SSLCertVerificationError as e:
             raise ValueError(str(e))
@@ -578,7 +818,7 @@ class Freepybox:
             fbx_entry = {uid: {"conn": fbx_api_add, "conf": fbx_conf, "desc": fbx_desc}}
             self._fbx_db.update(fbx_entry)
             fbx_conn = self._fbx_db[uid]["conn"]
-            if not self._readfile_fbx_db(Path(self.data_dir), uid):
+            if not self._read_fbx_db(uid):
                 write_db = True
 
         if fbx_addict is not None and fbx_addict not in fbx_conn:
@@ -587,16 +827,55 @@ class Freepybox:
             write_db = True
 
         if write_db:
-            asyncio.create_task(
-                self._writefile_fbx_db(Path(self.data_dir), uid, self._fbx_db[uid])
-            )
+            self._fbx_schedule_db_write(uid)
 
         return uid
 
+    def _fbx_schedule_db_write(self, uid: str) -> None:
+        """
+        Schedule a deferred db write, repeated updates within
+        ``_DEFAULT_DB_WRITE_DELAY`` are coalesced into a single write
+
+        uid : `str`
+        """
+
+        if uid in self._db_pending:
+            return
+        self._db_pending[uid] = asyncio.get_event_loop().call_later(
+            _DEFAULT_DB_WRITE_DELAY, self._fbx_write_db, uid
+        )
+
+    def _fbx_write_db(self, uid: str) -> None:
+        """
+        Start writing the db of uid
+
+        uid : `str`
+        """
+
+        del self._db_pending[uid]
+        task = asyncio.ensure_future(self._write_fbx_db(uid, self._fbx_db[uid]))
+        self._db_writes.add(task)
+        task.add_done_callback(self._fbx_write_db_done)
+
+    def _fbx_write_db_done(self, task: asyncio.Future) -> None:
+        """Untrack a finished db write"""
+
+        self._db_writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.error(f"Cannot write db: {str(task.exception())}")
+
+    async def _fbx_flush_db(self) -> None:
+        """Write pending db updates without waiting for the debounce delay"""
+
+        for uid, handle in list(self._db_pending.items()):
+            handle.cancel()
+            self._fbx_write_db(uid)
+        if self._db_writes:
+            await asyncio.gather(*self._db_writes, return_exceptions=True)
+
     async def _get_app_access(
         self,
         uid: str,
-        token_file: Path,
         app_desc: Dict[str, str],
         timeout: int = _DEFAULT_TIMEOUT,
     ) -> Access:
@@ -604,7 +883,6 @@ class Freepybox:
         Returns an access object used for HTTP(S) requests.
 
         uid : `str`
-        token_file : `Path`
         app_desc : `dict`
         timeout : `int`
             , Default to _DEFAULT_TIMEOUT
@@ -612,7 +890,7 @@ class Freepybox:
 
         # Read stored application token
         _LOGGER.debug("Reading application authorization file.")
-        app_token, track_id, file_app_desc = self._readfile_app_token(token_file, uid)
+        app_token, track_id, file_app_desc = await self._read_app_token(uid)
 
         # If no valid token is stored then request a token to freebox api - Only for LAN connection
         if app_token is None or file_app_desc != app_desc:
@@ -623,38 +901,22 @@ class Freepybox:
             # Get application token from the freebox
             app_token, track_id = await self._get_app_token(app_desc, uid, timeout)
 
-            # Check the authorization status
-            out_msg_flag = False
-            status = None
-            while status != "granted":
-                status = await self._get_authorization_status(track_id, uid, timeout)
-
-                # denied status = authorization failed
-                if status == "denied":
-                    raise AuthorizationError(
-                        f"{_DEFAULT_ERR}The app token is invalid or has been revoked."
-                    )
-
-                # Pending status : user must accept the app request on the freebox
-                elif status == "pending":
-                    if not out_msg_flag:
-                        out_msg_flag = True
-                        print("Please confirm the authentification on the freebox.")
-                        _LOGGER.info(
-                            f"User action required: please confirm access on freebox."
-                        )
-                    await asyncio.sleep(1)
-
-                # timeout = authorization failed
-                elif status == "timeout":
-                    raise AuthorizationError(f"{_DEFAULT_ERR}Authorization timed out.")
-
-            _LOGGER.info("Application authorization granted.")
+            # Wait for the user to accept the app request on the freebox
+            self.authorization = Authorization(
+                self._session,  # type: ignore # noqa
+                self._get_db_base_url(uid),
+                track_id,
+                timeout,
+                on_pending=self.auth_callback,
+                **self.auth_options,
+            )
+            try:
+                await self.authorization.wait()
+            finally:
+                self.authorization = None
 
             # Store application token in file
-            tk_file = self._writefile_app_token(
-                app_token, track_id, app_desc, token_file, uid
-            )
+            tk_file = await self._write_app_token(app_token, track_id, app_desc, uid)
             _LOGGER.info(f"Application token file was generated: {tk_file}.")
 
         # Create and return freebox http access module
@@ -701,32 +963,6 @@ class Freepybox:
         app_token, track_id = resp["result"]["app_token"], resp["result"]["track_id"]
         return app_token, track_id
 
-    async def _get_authorization_status(
-        self, track_id: str, uid: str, timeout: int = _DEFAULT_TIMEOUT
-    ) -> str:
-        """
-        Get authorization status of the application token
-
-        track_id : `str`
-        uid : `str`
-        timeout : `int`
-            , Default to _DEFAULT_TIMEOUT
-
-        Returns:
-            unknown     the app_token is invalid or has been revoked
-            pending     the user has not confirmed the authorization request yet
-            timeout     the user did not confirmed the authorization within the given time
-            granted     the app_token is valid and can be used to open a session
-            denied      the user denied the authorization request
-        """
-
-        url = urljoin(self._get_db_base_url(uid), f"login/authorize/{track_id}")
-        async with self._session.get(  # type: ignore # noqa
-            url, timeout=timeout, skip_auto_headers=["User-Agent"]
-        ) as r:
-            resp = await r.json()
-            return resp["result"]["status"]
-
     def _get_db_base_url(self, uid: str, api: Optional[bool] = True) -> str:
         """
         Returns base url for HTTP(S) requests
@@ -780,95 +1016,93 @@ class Freepybox:
         except ValueError:
             return False
 
-    def _readfile_app_token(self, file_p: Path, uid: str) -> Tuple[Any, Any, Any]:
+    async def _read_app_token(self, uid: str) -> Tuple[Any, Any, Any]:
         """
-        Read the application token in the authentication file.
+        Read the application token from the store.
 
-        file_p : `Path`
         uid : `str`
 
         Returns app_token, track_id, app_desc
         """
 
-        fname = file_p.joinpath(
-            _F_TOKEN_NAME + "_" + base64.b64encode(uid.encode("utf-8")).decode("utf-8")
-        )
-        try:
-            with bz2.open(fname, "rt", encoding="utf-8") as zf:
-                d = json.load(zf)
-                app_token = d["app_token"]
-                track_id = d["track_id"]
-                app_desc = {
-                    k: d[k]
-                    for k in ("app_id", "app_name", "app_version", "device_name")
-                    if k in d
-                }
-                return app_token, track_id, app_desc
-        except FileNotFoundError:
+        d = await self.read_store(STORE_TOKEN, uid)
+        if d is None:
             return None, None, None
+        app_token = d["app_token"]
+        track_id = d["track_id"]
+        app_desc = {
+            k: d[k]
+            for k in ("app_id", "app_name", "app_version", "device_name")
+            if k in d
+        }
+        return app_token, track_id, app_desc
 
-    def _readfile_fbx_db(self, file_p: Path, uid: str) -> Optional[Dict[str, Any]]:
+    def _read_fbx_db(self, uid: str) -> Optional[Dict[str, Any]]:
         """
-        Read the freebox db in the db file.
+        Read the freebox db from the store.
 
-        file_p : `Path`
         uid : `str`
 
         Returns fbx_db
         """
+        return self.store.read(STORE_DB, uid)
 
-        fname = file_p.joinpath(
-            _F_DB_NAME + "_" + base64.b64encode(uid.encode("utf-8")).decode("utf-8")
-        )
-        try:
-            with bz2.open(fname, "rt", encoding="utf-8") as zf:
-                d = json.load(zf)
-                return d
-        except FileNotFoundError:
-            return None
+    def _transport_closed(self, proto: Any) -> asyncio.Future:
+        """
+        Return a future done when the transport of a connection is lost
 
-    def _writefile_app_token(
-        self,
-        app_token: str,
-        track_id: str,
-        app_desc: Dict[str, str],
-        file_p: Path,
-        uid: str,
+        proto : `aiohttp.client_proto.ResponseHandler`
+        """
+
+        fut = getattr(proto, "closed", None)
+        if not isinstance(fut, asyncio.Future):
+            # aiohttp < 3.9, hook connection_lost
+            fut = asyncio.get_event_loop().create_future()
+            if proto.transport is None:
+                fut.set_result(None)
+            else:
+                lost = proto.connection_lost
+
+                def connection_lost(exc: Optional[BaseException]) -> None:
+                    try:
+                        lost(exc)
+                    finally:
+                        if not fut.done():
+                            fut.set_result(None)
+
+                proto.connection_lost = connection_lost
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return fut
+
+    async def _write_app_token(
+        self, app_token: str, track_id: str, app_desc: Dict[str, str], uid: str
     ) -> str:
         """
-        Store the application token in a ``_F_TOKEN`` file
+        Store the application token
 
         app_token : `str`
         track_id : `str`
         app_desc : `dict`
-        file_p : `Path`
         uid : `str`
         """
 
         d = {**app_desc, "app_token": app_token, "track_id": track_id}
-        fname = file_p.joinpath(
-            _F_TOKEN_NAME + "_" + base64.b64encode(uid.encode("utf-8")).decode("utf-8")
+        return await asyncio.get_event_loop().run_in_executor(
+            _IO_EXECUTOR, self.store.write, STORE_TOKEN, uid, d
         )
-        with bz2.open(fname, "wt", encoding="utf-8") as zf:
-            json.dump(d, zf)
-        return fspath(fname)
 
-    async def _writefile_fbx_db(
-        self, file_p: Path, uid: str, db: Dict[str, Any]
-    ) -> str:
+    async def _write_fbx_db(self, uid: str, db: Dict[str, Any]) -> str:
         """
-        Store the freebox db in a ``_F_DB`` file
+        Store the freebox db
 
-        file_p : `Path`
         uid : `str`
+        db : `dict`
         """
 
-        fname = file_p.joinpath(
-            _F_DB_NAME + "_" + base64.b64encode(uid.encode("utf-8")).decode("utf-8")
+        # Copy on the loop so later db updates cannot race the writer
+        return await asyncio.get_event_loop().run_in_executor(
+            _IO_EXECUTOR, self.store.write, STORE_DB, uid, copy.deepcopy(db)
         )
-        with bz2.open(fname, "wt", encoding="utf-8") as zf:
-            json.dump(db, zf)
-        return fspath(fname)
 
     @property
     def fbx_desc(self) -> Optional[dict]:
@@ -885,6 +1119,11 @@ class Freepybox:
         """Freebox available api modules list."""
         return self._api_mods_l()
 
+    @property
+    def fbx_ssl_context(self) -> ssl.SSLContext:
+        """SSL context trusting the freebox certificate authority."""
+        return _ssl_context(str(Path(_SELF_DIR).joinpath(_DEFAULT_CERT)))
+
     @property
     def fbx_uid(self) -> Optional[str]:
         """Freebox uid."""
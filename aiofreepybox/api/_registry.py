@@ -0,0 +1,37 @@
+# Generated by setup.py, do not edit
+
+API_MODULES = {
+    "airmedia": "Airmedia",
+    "call": "Call",
+    "connection": "Connection",
+    "contact": "Contact",
+    "dhcp": "Dhcp",
+    "domain": "Domain",
+    "downloads": "Downloads",
+    "freeplug": "Freeplug",
+    "fs": "Fs",
+    "ftp": "Ftp",
+    "fw": "Fw",
+    "home": "Home",
+    "lan": "Lan",
+    "lcd": "Lcd",
+    "meta": "Meta",
+    "netshare": "Netshare",
+    "notifications": "Notifications",
+    "parental": "Parental",
+    "phone": "Phone",
+    "player": "Player",
+    "remote": "Remote",
+    "rrd": "Rrd",
+    "sharelink": "Sharelink",
+    "storage": "Storage",
+    "switch": "Switch",
+    "system": "System",
+    "tv": "Tv",
+    "upload": "Upload",
+    "upnpav": "Upnpav",
+    "upnpigd": "Upnpigd",
+    "vm": "Vm",
+    "vpn": "Vpn",
+    "wifi": "Wifi",
+}
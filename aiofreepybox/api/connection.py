@@ -1,7 +1,18 @@
+import asyncio
+import time
 from typing import Any, Dict, List, Optional
 
+from aiofreepybox._helpers import Poller
 from aiofreepybox.access import Access
 
+_DEFAULT_FAST_INTERVAL = 5.0
+_DEFAULT_SLOW_INTERVAL = 60.0
+
+# Connection event kinds
+EVENT_DOWN = "down"
+EVENT_RATE_CHANGE = "rate_change"
+EVENT_UP = "up"
+
 
 class Connection:
     """
@@ -67,6 +78,21 @@ class Connection:
         """
         return await self._access.get("connection/xdsl/")
 
+    def monitor(
+        self,
+        fast_interval: float = _DEFAULT_FAST_INTERVAL,
+        slow_interval: float = _DEFAULT_SLOW_INTERVAL,
+    ) -> "ConnectionMonitor":
+        """
+        Return a monitor of the connection health
+
+        fast_interval : `float`, poll interval while degraded
+            , Default to _DEFAULT_FAST_INTERVAL
+        slow_interval : `float`, max poll interval while stable
+            , Default to _DEFAULT_SLOW_INTERVAL
+        """
+        return ConnectionMonitor(self, fast_interval, slow_interval)
+
     async def remove_connection_logs(self):
         """
         Remove connection logs
@@ -88,3 +114,153 @@ class Connection:
         lte_configuration_data : `dict`
         """
         await self._access.put("connection/lte/config/", lte_configuration_data)
+
+
+class ConnectionEvent:
+    """
+    Connection event
+
+    kind : `str`, EVENT_UP, EVENT_DOWN or EVENT_RATE_CHANGE
+    time : `float`, unix timestamp
+    data : `dict`, log entry or status fields
+    """
+
+    __slots__ = ("kind", "time", "data")
+
+    def __init__(self, kind: str, time: float, data: Dict[str, Any]) -> None:
+        self.kind = kind
+        self.time = time
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"<ConnectionEvent {self.kind} {self.time}>"
+
+
+class ConnectionMonitor(Poller):
+    """
+    Connection health monitor
+
+    Connection status, xdsl or ftth infos and logs are requested
+    concurrently. Logs are processed from the last seen entry only,
+    up and down events are taken from them with their own timestamp, or
+    from the status state when no log entry reports the transition.
+    Rate changes are taken from the status bandwidth.
+
+    The poll interval is fast_interval while the link is degraded or
+    changed, then doubles on each stable poll up to slow_interval.
+
+    connection : `Connection`
+    fast_interval : `float`
+    slow_interval : `float`
+    """
+
+    def __init__(
+        self, connection: Connection, fast_interval: float, slow_interval: float
+    ) -> None:
+        super().__init__("Connection", fast_interval)
+        self._connection = connection
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.status: Optional[Dict[str, Any]] = None
+        self.media_status: Optional[Dict[str, Any]] = None
+        self._last_log_id: Optional[int] = None
+
+    @property
+    def degraded(self) -> bool:
+        """Link is not up or its media reports no signal."""
+
+        if self.status is None or self.status.get("state") != "up":
+            return True
+        media = self.media_status or {}
+        if self.status.get("media") == "xdsl":
+            return media.get("status", {}).get("status") != "showtime"
+        if self.status.get("media") == "ftth":
+            return media.get("sfp_has_signal") is False
+        return False
+
+    async def poll(self) -> List[ConnectionEvent]:
+        """
+        Read the connection status, media infos and new logs,
+        and notify subscribers of the events
+
+        Returns the events
+        """
+
+        previous = self.status
+        if previous is None:
+            status, logs = await asyncio.gather(
+                self._connection.get_status(), self._connection.get_connection_logs()
+            )
+            self.media_status = await self._get_media(status)
+        else:
+            status, logs, self.media_status = await asyncio.gather(
+                self._connection.get_status(),
+                self._connection.get_connection_logs(),
+                self._get_media(previous),
+            )
+        self.status = status or {}
+
+        events = self._log_events(logs or [])
+        if previous is not None:
+            now = time.time()
+            was_up = previous.get("state") == "up"
+            is_up = self.status.get("state") == "up"
+            kinds = {e.kind for e in events}
+            if is_up != was_up and (EVENT_UP if is_up else EVENT_DOWN) not in kinds:
+                events.append(
+                    ConnectionEvent(EVENT_UP if is_up else EVENT_DOWN, now, self.status)
+                )
+            rates = ("bandwidth_down", "bandwidth_up")
+            if is_up and any(previous.get(k) != self.status.get(k) for k in rates):
+                events.append(
+                    ConnectionEvent(
+                        EVENT_RATE_CHANGE,
+                        now,
+                        {k: (previous.get(k), self.status.get(k)) for k in rates},
+                    )
+                )
+
+        if events or self.degraded:
+            self.interval = self.fast_interval
+        else:
+            self.interval = min(self.interval * 2, self.slow_interval)
+
+        if events:
+            await self.notify(events)
+        return events
+
+    def _poll_failed(self, e: Exception) -> None:
+        """Poll fast until the requests succeed again"""
+
+        super()._poll_failed(e)
+        self.interval = self.fast_interval
+
+    async def _get_media(self, status: Optional[Dict[str, Any]]) -> Any:
+        """Get the xdsl or ftth infos matching the status media"""
+
+        media = (status or {}).get("media")
+        if media == "xdsl":
+            return await self._connection.get_xdsl()
+        if media == "ftth":
+            return await self._connection.get_ftth()
+        return None
+
+    def _log_events(self, logs: List[Dict[str, Any]]) -> List[ConnectionEvent]:
+        """Return the events of the log entries newer than the last seen"""
+
+        last = self._last_log_id
+        new = sorted(
+            (e for e in logs if last is None or e["id"] > last), key=lambda e: e["id"]
+        )
+        if new:
+            self._last_log_id = new[-1]["id"]
+        # Entries logged before the first poll are history, not events
+        if last is None:
+            return []
+        return [
+            ConnectionEvent(
+                EVENT_UP if e["state"] == "up" else EVENT_DOWN, e["date"], e
+            )
+            for e in new
+            if e.get("state") in ("up", "down")
+        ]
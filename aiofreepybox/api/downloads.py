@@ -1,7 +1,22 @@
+import asyncio
 import base64
-from typing import Any, Dict, List, Optional
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
+from aiohttp import ClientError
+
+from aiofreepybox._helpers import Poller, bounded_gather
 from aiofreepybox.access import Access
+from aiofreepybox.exceptions import HttpRequestError
+
+_DEFAULT_BATCH_CONCURRENCY = 8
+_DEFAULT_FAST_INTERVAL = 2.0
+_DEFAULT_SLOW_INTERVAL = 60.0
+_DEFAULT_URLS_PER_REQUEST = 50
+_LOGGER = logging.getLogger(__name__)
+
+# Download states with transfers in progress
+_ACTIVE_STATES = ("starting", "downloading", "checking", "repairing", "extracting")
 
 
 class Downloads:
@@ -43,13 +58,15 @@ class Downloads:
     download_state_schema = {"status": download_state[0]}
     mark_item_as_read_schema = {"isRead": True}
 
-    async def add_download_advanced(self, download_advanced: Dict[str, Any]) -> None:
+    async def add_download_advanced(
+        self, download_advanced: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
         """
         Add download advanced
 
         download_advanced : `dict`
         """
-        await self._access.post("downloads/add/", download_advanced)
+        return await self._access.post("downloads/add/", download_advanced)
 
     async def add_download_from_file(self, download_file: Dict[str, Any]) -> None:
         """
@@ -67,6 +84,59 @@ class Downloads:
         """
         await self._access.post("downloads/add/", download_url)
 
+    async def add_downloads(
+        self,
+        urls: Sequence[str],
+        download_advanced: Optional[Dict[str, Any]] = None,
+        urls_per_request: int = _DEFAULT_URLS_PER_REQUEST,
+        concurrency: int = _DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Add downloads from urls
+
+        Urls are sent by groups of urls_per_request in the
+        ``download_url_list`` of advanced download requests, at most
+        concurrency requests are pending. The urls of a group rejected by
+        the box are sent again one by one, so that one bad url only fails
+        itself. A group failing on a transport error or a timeout is not
+        sent again, since the box may have added it.
+
+        urls : `list` of `str`
+        download_advanced : `dict`, other advanced download fields, optional
+            , Default to None
+        urls_per_request : `int` , optional
+            , Default to _DEFAULT_URLS_PER_REQUEST
+        concurrency : `int` , optional
+            , Default to _DEFAULT_BATCH_CONCURRENCY
+
+        Returns the results by url: `dict` with entry, result and error,
+        the result of an url added within a group is the group response
+        """
+
+        def add(group: List[str]) -> Awaitable[Optional[Dict[str, Any]]]:
+            return self.add_download_advanced(
+                {**(download_advanced or {}), "download_url_list": group}
+            )
+
+        size = max(1, urls_per_request)
+        groups = [list(urls[i : i + size]) for i in range(0, len(urls), size)]
+        results = await self._batch(groups, add, concurrency)
+        rejected = [
+            r for r in results if len(r["entry"]) > 1 and _is_api_error(r["error"])
+        ]
+        retried = iter(
+            await self._batch(
+                [[url] for r in rejected for url in r["entry"]], add, concurrency
+            )
+        )
+        by_url = []
+        for r in results:
+            if r in rejected:
+                by_url.extend(dict(next(retried), entry=url) for url in r["entry"])
+            else:
+                by_url.extend(dict(r, entry=url) for url in r["entry"])
+        return by_url
+
     async def create_download_blacklist_entry(
         self, download_blacklist_data: Dict[str, Any]
     ) -> None:
@@ -108,6 +178,29 @@ class Downloads:
         """
         await self._access.delete(f"downloads/{download_id}")
 
+    async def delete_downloads(
+        self,
+        download_ids: Sequence[int],
+        erase_files: bool = False,
+        concurrency: int = _DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Delete downloads, at most concurrency requests are pending
+
+        download_ids : `list` of `int`
+        erase_files : `bool`, also erase the downloaded files, optional
+            , Default to False
+        concurrency : `int` , optional
+            , Default to _DEFAULT_BATCH_CONCURRENCY
+
+        Returns the results by download id: `dict` with entry, result and error
+        """
+        return await self._batch(
+            download_ids,
+            self.delete_download_erase_files if erase_files else self.delete_download,
+            concurrency,
+        )
+
     async def delete_download_blacklist_entry(self, host: str) -> None:
         """
         Delete download blacklist entry
@@ -186,6 +279,28 @@ class Downloads:
         """
         return await self._access.put(f"downloads/{download_id}", download_state_data)
 
+    async def edit_downloads_state(
+        self,
+        download_ids: Sequence[int],
+        status: str,
+        concurrency: int = _DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Edit the state of downloads, at most concurrency requests are pending
+
+        download_ids : `list` of `int`
+        status : `str`, see download_state
+        concurrency : `int` , optional
+            , Default to _DEFAULT_BATCH_CONCURRENCY
+
+        Returns the results by download id: `dict` with entry, result and error
+        """
+        return await self._batch(
+            download_ids,
+            lambda i: self.edit_download_state(i, {"status": status}),
+            concurrency,
+        )
+
     async def edit_download_tracker(
         self, download_id: int, tracker_url: str, download_tracker_data: Dict[str, Any]
     ) -> None:
@@ -322,6 +437,21 @@ class Downloads:
             f"downloads/feeds/{feed_id}/items/{item_id}", mark_item_as_read
         )
 
+    def monitor(
+        self,
+        fast_interval: float = _DEFAULT_FAST_INTERVAL,
+        slow_interval: float = _DEFAULT_SLOW_INTERVAL,
+    ) -> "DownloadMonitor":
+        """
+        Return a monitor of the download tasks
+
+        fast_interval : `float`, poll interval while downloads are active
+            , Default to _DEFAULT_FAST_INTERVAL
+        slow_interval : `float`, max poll interval while idle
+            , Default to _DEFAULT_SLOW_INTERVAL
+        """
+        return DownloadMonitor(self, fast_interval, slow_interval)
+
     async def remove_download_tracker(
         self, download_id: int, tracker_url: str, download_tracker: Dict[str, Any]
     ) -> None:
@@ -346,3 +476,112 @@ class Downloads:
         """
         return await self._access.put("downloads/config/", downloads_configuration)
 
+    async def _batch(
+        self,
+        entries: Sequence[Any],
+        request: Callable[[Any], Awaitable[Any]],
+        concurrency: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run request for each entry concurrently, at most concurrency at a time
+
+        entries : `list`
+        request : `callable`, coroutine function called with an entry
+        concurrency : `int`
+        """
+
+        async def apply(entry: Any) -> Dict[str, Any]:
+            try:
+                result = await request(entry)
+            except (ClientError, HttpRequestError, asyncio.TimeoutError) as e:
+                _LOGGER.warning(f"Download batch request failed: {str(e)}")
+                return {"entry": entry, "result": None, "error": e}
+            return {"entry": entry, "result": result, "error": None}
+
+        return await bounded_gather([apply(e) for e in entries], concurrency)
+
+
+class DownloadMonitor(Poller):
+    """
+    Download tasks monitor
+
+    Subscribers are only called with the fields that changed since the
+    previous poll, as a list of (download_id, changes) where changes is a
+    `dict` of field: (old value, new value), or `None` for removed tasks.
+    Throughput is computed from the byte counters of consecutive polls.
+
+    The poll interval is fast_interval while a task is active or changed,
+    then doubles on each idle poll up to slow_interval.
+
+    downloads : `Downloads`
+    fast_interval : `float`
+    slow_interval : `float`
+    """
+
+    def __init__(
+        self, downloads: Downloads, fast_interval: float, slow_interval: float
+    ) -> None:
+        super().__init__("Downloads", fast_interval)
+        self._downloads = downloads
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.tasks: Dict[int, Dict[str, Any]] = {}
+        self.throughput: Dict[int, Tuple[float, float]] = {}
+        self._time: Optional[float] = None
+
+    @property
+    def total_throughput(self) -> Tuple[float, float]:
+        """Rx and tx bytes per second of all tasks."""
+        return (
+            sum(t[0] for t in self.throughput.values()),
+            sum(t[1] for t in self.throughput.values()),
+        )
+
+    async def poll(self) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+        """
+        Read the download tasks and notify subscribers of the changes
+
+        Returns the changes
+        """
+
+        tasks = {t["id"]: t for t in await self._downloads.get_downloads() or []}
+        now = asyncio.get_event_loop().time()
+        elapsed = now - self._time if self._time is not None else 0.0
+        self._time = now
+
+        changes: List[Tuple[int, Optional[Dict[str, Any]]]] = []
+        throughput: Dict[int, Tuple[float, float]] = {}
+        for task_id, task in tasks.items():
+            old = self.tasks.get(task_id, {})
+            diff = {k: (old.get(k), v) for k, v in task.items() if old.get(k) != v}
+            if diff:
+                changes.append((task_id, diff))
+            if old and elapsed > 0:
+                throughput[task_id] = (
+                    max(0, task.get("rx_bytes", 0) - old.get("rx_bytes", 0)) / elapsed,
+                    max(0, task.get("tx_bytes", 0) - old.get("tx_bytes", 0)) / elapsed,
+                )
+        changes.extend(
+            (task_id, None) for task_id in self.tasks if task_id not in tasks
+        )
+        self.tasks = tasks
+        self.throughput = throughput
+
+        active = any(t.get("status") in _ACTIVE_STATES for t in tasks.values())
+        if active or changes:
+            self.interval = self.fast_interval
+        else:
+            self.interval = min(self.interval * 2, self.slow_interval)
+
+        if changes:
+            await self.notify(changes)
+        return changes
+
+
+def _is_api_error(e: Optional[Exception]) -> bool:
+    """Return `True` if e is an error answered by the box"""
+
+    # Access wraps timeouts in HttpRequestError
+    return isinstance(e, HttpRequestError) and not (
+        e.args and isinstance(e.args[0], BaseException)
+    )
@@ -1,14 +1,42 @@
-from typing import Any, Dict, List, Optional
-
+import asyncio
+from collections import deque
+import logging
+import os
+from pathlib import Path
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from aiohttp.client_exceptions import ClientError
 from aiohttp.client_reqrep import ClientResponse
 
+from aiofreepybox._helpers import Poller
 from aiofreepybox.access import Access
+from aiofreepybox.exceptions import HttpRequestError
 
 _DEFAULT_CAMERA_INDEX = 0
+_DEFAULT_CAMERA_TTL = 60
 _DEFAULT_CHANNEL = 2
+_DEFAULT_FPS = 2.0
+_DEFAULT_IN_FLIGHT = 2
+_DEFAULT_MONITOR_INTERVAL = 5.0
+_DEFAULT_NODES_INTERVAL = 300.0
+_DEFAULT_PREFETCH = 3
+_DEFAULT_ROLLING_FILES = 10
 _DEFAULT_SIZE = 4
 _DEFAULT_QUALITY = 5
 _DEFAULT_STREAM = "stream.m3u8"
+_DEFAULT_TARGET_DURATION = 2.0
+_LOGGER = logging.getLogger(__name__)
 
 
 class Home:
@@ -20,6 +48,7 @@ class Home:
 
     def __init__(self, access: Access) -> None:
         self._access = access
+        self.cameras = CameraRegistry(self)
 
     create_home_node_rule_payload_schema = {
         "icon_url": "",
@@ -44,6 +73,24 @@ class Home:
     start_pairing_step_payload_schema = {"nfc": True, "qrcode": False, "type": ""}
     stop_pairing_step_payload_schema = {"session": 0}
 
+    def camera_stream(
+        self,
+        camera_index: int = _DEFAULT_CAMERA_INDEX,
+        channel: int = _DEFAULT_CHANNEL,
+        prefetch: int = _DEFAULT_PREFETCH,
+    ) -> "CameraStream":
+        """
+        Return a HLS stream consumer for a camera
+
+        camera_index : `int`
+            , Default to _DEFAULT_CAMERA_INDEX
+        channel : 1 is SD, 2 is HD
+            , Default to _DEFAULT_CHANNEL
+        prefetch : `int`, segments downloaded concurrently
+            , Default to _DEFAULT_PREFETCH
+        """
+        return CameraStream(self, camera_index, channel, prefetch)
+
     async def create_sms_number(self, sms_number_data: Dict[str, Any]):
         """
         Create sms number
@@ -128,10 +175,10 @@ class Home:
             , Default to _DEFAULT_QUALITY
         """
 
-        fbx_cameras = await self.get_camera()
-        if fbx_cameras is not None:
+        stream_url = await self._get_camera_stream_url(camera_index)
+        if stream_url is not None:
             return await self._access.get(
-                fbx_cameras[camera_index]["stream_url"].replace(
+                stream_url.replace(
                     _DEFAULT_STREAM, f"snapshot.cgi?size={size}&quality={quality}"
                 )[1:]
             )
@@ -150,10 +197,10 @@ class Home:
             , Default to _DEFAULT_CHANNEL
         """
 
-        fbx_cameras = await self.get_camera()
-        if fbx_cameras is not None:
+        stream_url = await self._get_camera_stream_url(camera_index)
+        if stream_url is not None:
             return await self._access.get(
-                fbx_cameras[camera_index]["stream_url"].replace(
+                stream_url.replace(
                     _DEFAULT_STREAM, f"{_DEFAULT_STREAM}?channel={channel}"
                 )[1:]
             )
@@ -171,16 +218,38 @@ class Home:
             , Default to _DEFAULT_CAMERA_INDEX
         """
 
-        fbx_cameras = await self.get_camera()
-        if fbx_cameras is not None:
+        stream_url = await self._get_camera_stream_url(camera_index)
+        if stream_url is not None:
             return await self._access.get(
-                fbx_cameras[camera_index]["stream_url"].replace(
-                    _DEFAULT_STREAM, f"{ts_name}"
-                )[1:]
+                stream_url.replace(_DEFAULT_STREAM, f"{ts_name}")[1:]
             )
         else:
             return None
 
+    def snapshot_stream(
+        self,
+        camera_index: Optional[int] = _DEFAULT_CAMERA_INDEX,
+        fps: float = _DEFAULT_FPS,
+        size: int = _DEFAULT_SIZE,
+        quality: int = _DEFAULT_QUALITY,
+        in_flight: int = _DEFAULT_IN_FLIGHT,
+    ) -> "SnapshotStream":
+        """
+        Return a stream of camera snapshots taken at a target rate
+
+        camera_index : `int`, `None` for all cameras
+            , Default to _DEFAULT_CAMERA_INDEX
+        fps : `float`, snapshots per second and per camera
+            , Default to _DEFAULT_FPS
+        size : 2 = 320x240, 3 = 640x480, 4 = 1280x720
+            , Default to _DEFAULT_SIZE
+        quality : quality index
+            , Default to _DEFAULT_QUALITY
+        in_flight : `int`, concurrent requests per camera
+            , Default to _DEFAULT_IN_FLIGHT
+        """
+        return SnapshotStream(self, camera_index, fps, size, quality, in_flight)
+
     async def get_home_adapter(self, home_adapter_id: int) -> Optional[Dict[str, Any]]:
         """
         Retrieve a registered home adapter
@@ -205,15 +274,24 @@ class Home:
         return await self._access.get(f"home/endpoints/{node_id}/{endpoint_id}")
 
     async def get_home_endpoint_values(
-        self, endpoint_list: List[int]
+        self, endpoint_list: List[Dict[str, int]]
     ) -> Optional[List[Any]]:
         """
         Get home endpoint values
 
-        endpoint_list : `[endpoint_id]`
+        endpoint_list : `[{"node_id": node_id, "id": endpoint_id}]`
         """
         return await self._access.post("home/endpoints/get", endpoint_list)
 
+    async def get_home_graph(self) -> "HomeGraph":
+        """
+        Get home nodes, links, adapters and tilesets as an indexed graph
+        """
+
+        graph = HomeGraph(self)
+        await graph.refresh()
+        return graph
+
     async def get_home_links(self) -> Optional[List[Dict[str, Any]]]:
         """
         Get home links
@@ -328,6 +406,21 @@ class Home:
         """
         return await self._access.get("home/sms/numbers")
 
+    def monitor(
+        self,
+        interval: float = _DEFAULT_MONITOR_INTERVAL,
+        nodes_interval: float = _DEFAULT_NODES_INTERVAL,
+    ) -> "HomeMonitor":
+        """
+        Return a monitor of the home signal endpoint values
+
+        interval : `float`, poll interval
+            , Default to _DEFAULT_MONITOR_INTERVAL
+        nodes_interval : `float`, endpoint list refresh interval
+            , Default to _DEFAULT_NODES_INTERVAL
+        """
+        return HomeMonitor(self, interval, nodes_interval)
+
     async def next_home_pairing_step(
         self, home_adapter_id: int, next_p_s_payload: Dict[str, Any]
     ):
@@ -449,3 +542,618 @@ class Home:
             f"home/sms/numbers/{sms_number_id}/validate", sms_n_v_data
         )
 
+    async def _get_camera_stream_url(self, camera_index: int) -> Optional[str]:
+        """
+        Get camera stream url from the camera registry
+
+        camera_index : `int`
+        """
+
+        camera = await self.cameras.by_index(camera_index)
+        return camera["stream_url"] if camera is not None else None
+
+
+class CameraRegistry:
+    """
+    Camera list cache, indexed by position and camera id
+
+    Concurrent lookups share a single camera request.
+
+    home : `Home`
+    ttl : `float`
+        , Default to _DEFAULT_CAMERA_TTL
+    """
+
+    def __init__(self, home: Home, ttl: float = _DEFAULT_CAMERA_TTL) -> None:
+        self._home = home
+        self.ttl = ttl
+        self._by_id: Dict[Any, Dict[str, Any]] = {}
+        self._cameras: Optional[List[Dict[str, Any]]] = None
+        self._fetch: Optional[asyncio.Future] = None
+        self._time = 0.0
+
+    async def by_id(self, camera_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get camera by id
+
+        camera_id : `int`
+        """
+
+        await self.get()
+        return self._by_id.get(camera_id)
+
+    async def by_index(self, camera_index: int) -> Optional[Dict[str, Any]]:
+        """
+        Get camera by position in the camera list
+
+        camera_index : `int`
+        """
+
+        cameras = await self.get()
+        return cameras[camera_index] if cameras is not None else None
+
+    async def get(self, refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the camera list
+
+        refresh : `bool`, ignore the cached list
+            , Default to False
+        """
+
+        if (
+            not refresh
+            and self._cameras is not None
+            and time.monotonic() - self._time < self.ttl
+        ):
+            return self._cameras
+        if self._fetch is None:
+            self._fetch = asyncio.ensure_future(self._home.get_camera())
+        fetch = self._fetch
+        try:
+            cameras = await asyncio.shield(fetch)
+        finally:
+            if self._fetch is fetch and fetch.done():
+                self._fetch = None
+        if cameras is not None and cameras is not self._cameras:
+            self._cameras = cameras
+            self._by_id = {c.get("id"): c for c in cameras}
+            self._time = time.monotonic()
+        return cameras
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached camera list
+        """
+        self._cameras = None
+
+
+class CameraStream:
+    """
+    Camera HLS stream consumer
+
+    Polls the camera playlist and downloads new TS segments concurrently,
+    at most prefetch at a time, segments are yielded in playlist order.
+
+    home : `Home`
+    camera_index : `int`
+    channel : `int`
+    prefetch : `int`
+    """
+
+    def __init__(
+        self, home: Home, camera_index: int, channel: int, prefetch: int
+    ) -> None:
+        self._home = home
+        self.camera_index = camera_index
+        self.channel = channel
+        self.prefetch = max(1, prefetch)
+        self._stopped = False
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._iter_data()
+
+    def stop(self) -> None:
+        """
+        Stop the stream after the segment being consumed
+        """
+        self._stopped = True
+
+    async def segments(self) -> AsyncIterator[Tuple[str, bytes]]:
+        """
+        Yield (segment name, segment data) in playlist order
+        """
+
+        last_seq: Optional[int] = None
+        pending: Deque[Tuple[str, asyncio.Future]] = deque()
+        self._stopped = False
+        try:
+            while not self._stopped:
+                target, seq, names, ended = await self._get_playlist()
+                if last_seq is None:
+                    # Start at the live edge
+                    last_seq = seq + len(names) - 1 - self.prefetch
+                elif seq > last_seq + 1:
+                    _LOGGER.debug(f"{seq - last_seq - 1} camera segment(s) skipped")
+                new = [
+                    (seq + i, name)
+                    for i, name in enumerate(names)
+                    if seq + i > last_seq
+                ]
+
+                for n, name in new:
+                    while len(pending) >= self.prefetch:
+                        yield await self._pop(pending)
+                        if self._stopped:
+                            return
+                    pending.append((name, asyncio.ensure_future(self._get_ts(name))))
+                    last_seq = n
+
+                if not new or ended:
+                    if not pending:
+                        await asyncio.sleep(target / 2)
+                    while pending:
+                        yield await self._pop(pending)
+                        if self._stopped:
+                            return
+                    if ended:
+                        return
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def write(
+        self, directory: str, max_files: int = _DEFAULT_ROLLING_FILES
+    ) -> None:
+        """
+        Write segments to a rolling set of files and a local playlist,
+        until the stream is stopped
+
+        directory : `str`
+        max_files : `int`
+            , Default to _DEFAULT_ROLLING_FILES
+        """
+
+        loop = asyncio.get_event_loop()
+        path = Path(directory)
+        files: Deque[str] = deque()
+        seq = 0
+        async for name, data in self.segments():
+            fname = os.path.basename(name.split("?", 1)[0])
+            await loop.run_in_executor(None, path.joinpath(fname).write_bytes, data)
+            files.append(fname)
+            seq += 1
+            while len(files) > max_files:
+                await loop.run_in_executor(
+                    None, _unlink, path.joinpath(files.popleft())
+                )
+            playlist = "\n".join(
+                [
+                    "#EXTM3U",
+                    f"#EXT-X-TARGETDURATION:{int(_DEFAULT_TARGET_DURATION)}",
+                    f"#EXT-X-MEDIA-SEQUENCE:{seq - len(files)}",
+                ]
+                + [f"#EXTINF:{_DEFAULT_TARGET_DURATION},\n{f}" for f in files]
+                + [""]
+            )
+            await loop.run_in_executor(
+                None, path.joinpath(_DEFAULT_STREAM).write_text, playlist
+            )
+
+    async def _get_playlist(self) -> Tuple[float, int, List[str], bool]:
+        """
+        Get and parse the camera playlist
+
+        Returns target duration, media sequence, segment names, end of list
+        """
+
+        r = await self._home.get_camera_stream_m3u8(self.camera_index, self.channel)
+        if r is None:
+            raise ValueError("No camera")
+        try:
+            text = await r.text()
+        finally:
+            r.release()
+
+        target, seq, names, ended = _DEFAULT_TARGET_DURATION, 0, [], False
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith("#EXT-X-TARGETDURATION:"):
+                target = float(line.split(":", 1)[1])
+            elif line.startswith("#EXT-X-MEDIA-SEQUENCE:"):
+                seq = int(line.split(":", 1)[1])
+            elif line.startswith("#EXT-X-ENDLIST"):
+                ended = True
+            elif line and not line.startswith("#"):
+                names.append(line)
+        return target, seq, names, ended
+
+    async def _get_ts(self, name: str) -> bytes:
+        """
+        Download a segment
+
+        name : `str`
+        """
+
+        r = await self._home.get_camera_ts(name, self.camera_index)
+        if r is None:
+            raise ValueError("No camera")
+        try:
+            return await r.read()
+        finally:
+            r.release()
+
+    async def _iter_data(self) -> AsyncIterator[bytes]:
+        """Yield segment data"""
+
+        async for _, data in self.segments():
+            yield data
+
+    async def _pop(
+        self, pending: Deque[Tuple[str, asyncio.Future]]
+    ) -> Tuple[str, bytes]:
+        """Wait for the oldest pending segment"""
+
+        name, task = pending[0]
+        data = await task
+        pending.popleft()
+        return name, data
+
+
+class HomeGraph:
+    """
+    In-memory home automation graph
+
+    Nodes are indexed by id, adapter, category and label, endpoints
+    by (node_id, endpoint_id) and name.
+
+    home : `Home`
+    """
+
+    def __init__(self, home: Home) -> None:
+        self._home = home
+        self.adapters: Dict[int, Dict[str, Any]] = {}
+        self.links: List[Dict[str, Any]] = []
+        self.nodes: Dict[int, Dict[str, Any]] = {}
+        self.tilesets: List[Dict[str, Any]] = []
+        self._by_adapter: Dict[Any, Set[int]] = {}
+        self._by_category: Dict[Any, Set[int]] = {}
+        self._by_label: Dict[Any, Set[int]] = {}
+        self._by_ep_name: Dict[Any, Set[Tuple[int, int]]] = {}
+        self._endpoints: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    def endpoint(self, node_id: int, endpoint_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get endpoint
+
+        node_id : `int`
+        endpoint_id : `int`
+        """
+        return self._endpoints.get((node_id, endpoint_id))
+
+    def endpoints_by_name(self, name: str) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Get endpoints by name
+
+        name : `str`
+
+        Returns a list of (node_id, endpoint)
+        """
+        return [(k[0], self._endpoints[k]) for k in self._by_ep_name.get(name, ())]
+
+    def node(self, node_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get node
+
+        node_id : `int`
+        """
+        return self.nodes.get(node_id)
+
+    def nodes_by_adapter(self, adapter_id: int) -> List[Dict[str, Any]]:
+        """
+        Get nodes of an adapter
+
+        adapter_id : `int`
+        """
+        return [self.nodes[i] for i in self._by_adapter.get(adapter_id, ())]
+
+    def nodes_by_category(self, category: str) -> List[Dict[str, Any]]:
+        """
+        Get nodes of a category
+
+        category : `str`
+        """
+        return [self.nodes[i] for i in self._by_category.get(category, ())]
+
+    def nodes_by_label(self, label: str) -> List[Dict[str, Any]]:
+        """
+        Get nodes by label
+
+        label : `str`
+        """
+        return [self.nodes[i] for i in self._by_label.get(label, ())]
+
+    async def refresh(self) -> None:
+        """
+        Rebuild the graph, the four lists are requested concurrently
+        """
+
+        nodes, links, adapters, tilesets = await asyncio.gather(
+            self._home.get_home_nodes(),
+            self._home.get_home_links(),
+            self._home.get_home_adapters(),
+            self._home.get_home_tilesets(),
+        )
+        self.adapters = {a["id"]: a for a in adapters or []}
+        self.links = links or []
+        self.tilesets = tilesets or []
+        self.nodes = {}
+        self._by_adapter, self._by_category, self._by_label = {}, {}, {}
+        self._by_ep_name, self._endpoints = {}, {}
+        for node in nodes or []:
+            self._index(node)
+
+    async def refresh_node(self, node_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Refresh a single node
+
+        node_id : `int`
+
+        Returns the node or `None` if it does not exist anymore
+        """
+
+        node = await self._home.get_home_node(node_id)
+        self._unindex(node_id)
+        if node is not None:
+            self._index(node)
+        return node
+
+    def _index(self, node: Dict[str, Any]) -> None:
+        """Add a node to the indexes"""
+
+        node_id = node["id"]
+        self.nodes[node_id] = node
+        self._by_adapter.setdefault(node.get("adapter"), set()).add(node_id)
+        self._by_category.setdefault(node.get("category"), set()).add(node_id)
+        self._by_label.setdefault(node.get("label"), set()).add(node_id)
+        for ep in node.get("show_endpoints", []):
+            self._endpoints[(node_id, ep["id"])] = ep
+            self._by_ep_name.setdefault(ep.get("name"), set()).add((node_id, ep["id"]))
+
+    def _unindex(self, node_id: int) -> None:
+        """Remove a node from the indexes"""
+
+        node = self.nodes.pop(node_id, None)
+        if node is None:
+            return
+        for index, k in (
+            (self._by_adapter, node.get("adapter")),
+            (self._by_category, node.get("category")),
+            (self._by_label, node.get("label")),
+        ):
+            index[k].discard(node_id)
+            if not index[k]:
+                del index[k]
+        for ep in node.get("show_endpoints", []):
+            self._endpoints.pop((node_id, ep["id"]), None)
+            names = self._by_ep_name[ep.get("name")]
+            names.discard((node_id, ep["id"]))
+            if not names:
+                del self._by_ep_name[ep.get("name")]
+
+
+class HomeMonitor(Poller):
+    """
+    Home signal endpoints monitor
+
+    All signal endpoints of the home nodes are read with a single batched
+    request per interval. Last values are kept in a table and subscribers
+    are only called with the values that changed, as a list of
+    (node_id, endpoint_id, old value, new value).
+
+    home : `Home`
+    interval : `float`
+    nodes_interval : `float`
+    """
+
+    def __init__(self, home: Home, interval: float, nodes_interval: float) -> None:
+        super().__init__("Home endpoints", interval)
+        self._home = home
+        self.nodes_interval = nodes_interval
+        self._keys: List[Tuple[int, int]] = []
+        self._slots: Dict[Tuple[int, int], int] = {}
+        self._values: List[Any] = []
+        self._payload: List[Dict[str, int]] = []
+        self._nodes_time: Optional[float] = None
+
+    def value(self, node_id: int, endpoint_id: int) -> Any:
+        """
+        Return the last value of an endpoint
+
+        node_id : `int`
+        endpoint_id : `int`
+        """
+        return self._values[self._slots[(node_id, endpoint_id)]]
+
+    async def poll(self) -> List[Tuple[int, int, Any, Any]]:
+        """
+        Read all signal endpoints and notify subscribers of changed values
+
+        Returns the changed values
+        """
+
+        loop = asyncio.get_event_loop()
+        if (
+            self._nodes_time is None
+            or loop.time() - self._nodes_time > self.nodes_interval
+        ):
+            await self.refresh_endpoints()
+        if not self._payload:
+            return []
+
+        values = await self._home.get_home_endpoint_values(self._payload) or []
+        changes = []
+        for slot, v in enumerate(values[: len(self._keys)]):
+            v = v.get("value") if isinstance(v, dict) else v
+            if v != self._values[slot]:
+                node_id, endpoint_id = self._keys[slot]
+                changes.append((node_id, endpoint_id, self._values[slot], v))
+                self._values[slot] = v
+
+        if changes:
+            await self.notify(changes)
+        return changes
+
+    async def refresh_endpoints(self) -> None:
+        """
+        Rebuild the signal endpoints table from the home nodes,
+        known endpoints keep their last value
+        """
+
+        nodes = await self._home.get_home_nodes() or []
+        keys = [
+            (node["id"], ep["id"])
+            for node in nodes
+            for ep in node.get("show_endpoints", [])
+            if ep.get("ep_type") == "signal"
+        ]
+        self._values = [
+            self._values[self._slots[k]] if k in self._slots else None for k in keys
+        ]
+        self._keys = keys
+        self._slots = {k: i for i, k in enumerate(keys)}
+        self._payload = [{"node_id": n, "id": e} for n, e in keys]
+        self._nodes_time = asyncio.get_event_loop().time()
+
+
+class SnapshotStream:
+    """
+    Camera snapshot stream
+
+    Snapshot requests are started at the target rate for every camera,
+    with at most in_flight pending requests per camera. Ticks with no
+    request slot and frames the consumer did not take before newer
+    ones arrived are dropped and counted in ``dropped``.
+
+    Yields (camera_index, monotonic time, jpeg data)
+
+    home : `Home`
+    camera_index : `int` or `None` for all cameras
+    fps : `float`
+    size : `int`
+    quality : `int`
+    in_flight : `int`
+    """
+
+    def __init__(
+        self,
+        home: Home,
+        camera_index: Optional[int],
+        fps: float,
+        size: int,
+        quality: int,
+        in_flight: int,
+    ) -> None:
+        self._home = home
+        self.camera_index = camera_index
+        self.period = 1 / fps
+        self.size = size
+        self.quality = quality
+        self.in_flight = max(1, in_flight)
+        self.dropped = 0
+        self._frames: Optional[asyncio.Queue] = None
+        self._last: Dict[int, int] = {}
+        self._shots: List[asyncio.Future] = []
+
+    def __aiter__(self) -> AsyncIterator[Tuple[int, float, bytes]]:
+        return self._iter_frames()
+
+    async def _iter_frames(self) -> AsyncIterator[Tuple[int, float, bytes]]:
+        """Run the tickers and yield frames"""
+
+        cameras = await self._home.cameras.get()
+        if not cameras:
+            return
+        if self.camera_index is not None and not (
+            -len(cameras) <= self.camera_index < len(cameras)
+        ):
+            raise IndexError(
+                f"Camera index {self.camera_index} out of range, "
+                f"{len(cameras)} cameras found"
+            )
+        indexes: Sequence[int] = (
+            range(len(cameras)) if self.camera_index is None else [self.camera_index]
+        )
+        self._frames = asyncio.Queue(maxsize=len(indexes))
+        tickers = [asyncio.ensure_future(self._tick(i)) for i in indexes]
+        try:
+            while True:
+                yield await self._frames.get()
+        finally:
+            for task in tickers + self._shots:
+                task.cancel()
+
+    def _offer(
+        self, camera_index: int, seq: int, frame: Tuple[int, float, bytes]
+    ) -> None:
+        """Queue a frame, dropping the oldest one when the consumer lags"""
+
+        # A later snapshot of this camera was already queued
+        if seq <= self._last.get(camera_index, -1):
+            self.dropped += 1
+            return
+        self._last[camera_index] = seq
+        if self._frames.full():  # type: ignore # noqa
+            self._frames.get_nowait()  # type: ignore # noqa
+            self.dropped += 1
+        self._frames.put_nowait(frame)  # type: ignore # noqa
+
+    async def _shoot(self, camera_index: int, seq: int, sem: asyncio.Semaphore) -> None:
+        """Take a snapshot"""
+
+        try:
+            r = await self._home.get_camera_snapshot(
+                camera_index, self.size, self.quality
+            )
+            if r is None:
+                return
+            # Errors are answered as a json dict instead of a response
+            if not hasattr(r, "read"):
+                _LOGGER.debug(f"Snapshot of camera {camera_index} failed: {r!r}")
+                return
+            try:
+                data = await r.read()
+            finally:
+                r.release()
+            self._offer(camera_index, seq, (camera_index, time.monotonic(), data))
+        except (ClientError, HttpRequestError) as e:
+            _LOGGER.debug(f"Snapshot of camera {camera_index} failed: {str(e)}")
+        finally:
+            sem.release()
+
+    async def _tick(self, camera_index: int) -> None:
+        """Start snapshot requests of a camera at the target rate"""
+
+        loop = asyncio.get_event_loop()
+        sem = asyncio.Semaphore(self.in_flight)
+        next_t = loop.time()
+        seq = 0
+        while True:
+            if sem.locked():
+                self.dropped += 1
+            else:
+                await sem.acquire()
+                shot = asyncio.ensure_future(self._shoot(camera_index, seq, sem))
+                self._shots.append(shot)
+                shot.add_done_callback(self._shots.remove)
+                seq += 1
+            next_t += self.period
+            await asyncio.sleep(max(0.0, next_t - loop.time()))
+
+
+def _unlink(path: Path) -> None:
+    """Remove a file if it exists"""
+
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
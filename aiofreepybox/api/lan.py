@@ -1,8 +1,11 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
+from aiofreepybox._helpers import Poller
 from aiofreepybox.access import Access
 
 _DEFAULT_INTERFACE = "pub"
+_DEFAULT_TRACKER_INTERVAL = 10.0
 
 
 class Lan:
@@ -108,6 +111,15 @@ class Lan:
             f"lan/browser/{interface}/{host_id}", lan_host_data
         )
 
+    def tracker(self, interval: float = _DEFAULT_TRACKER_INTERVAL) -> "LanTracker":
+        """
+        Return a tracker of the hosts of all lan interfaces
+
+        interval : `float`, poll interval
+            , Default to _DEFAULT_TRACKER_INTERVAL
+        """
+        return LanTracker(self, interval)
+
     async def wake_lan_host(
         self, wol: Dict[str, str], interface: str = _DEFAULT_INTERFACE
     ):
@@ -119,3 +131,201 @@ class Lan:
             , Default to _DEFAULT_INTERFACE
         """
         return await self._access.post(f"lan/wol/{interface}/", wol)
+
+
+class LanHost:
+    """
+    Compact lan host record
+
+    id : `str`
+    interface : `str`
+    mac : `str`, normalized mac address
+    name : `str`, primary name
+    host_type : `str`
+    ips : `tuple`, active l3 addresses
+    active : `bool`
+    """
+
+    __slots__ = ("id", "interface", "mac", "name", "host_type", "ips", "active")
+
+    def __init__(
+        self,
+        id: str,
+        interface: str,
+        mac: str,
+        name: str,
+        host_type: str,
+        ips: Tuple[str, ...],
+        active: bool,
+    ) -> None:
+        self.id = id
+        self.interface = interface
+        self.mac = mac
+        self.name = name
+        self.host_type = host_type
+        self.ips = ips
+        self.active = active
+
+    def __repr__(self) -> str:
+        return f"<LanHost {self.name} {self.mac} {self.interface}>"
+
+
+class LanTracker(Poller):
+    """
+    Lan hosts presence tracker
+
+    The hosts of all interfaces are requested concurrently and kept as
+    compact `LanHost` records indexed by host id, mac and ip. Each poll
+    is diffed against the records in linear time and subscribers are only
+    called with the deltas, as a list of (event, host, previous name)
+    where event is "join", "leave" or "rename".
+
+    lan : `Lan`
+    interval : `float`
+    """
+
+    def __init__(self, lan: Lan, interval: float) -> None:
+        super().__init__("Lan hosts", interval)
+        self._lan = lan
+        self._hosts: Dict[str, LanHost] = {}
+        self._by_mac: Dict[str, LanHost] = {}
+        self._by_ip: Dict[str, LanHost] = {}
+
+    def by_id(self, host_id: str) -> Optional[LanHost]:
+        """
+        Get host by id
+
+        host_id : `str`
+        """
+        return self._hosts.get(host_id)
+
+    def by_ip(self, ip: str) -> Optional[LanHost]:
+        """
+        Get host by active ip address
+
+        ip : `str`
+        """
+        return self._by_ip.get(ip)
+
+    def by_mac(self, mac: str) -> Optional[LanHost]:
+        """
+        Get host by mac address
+
+        mac : `str`
+        """
+        return self._by_mac.get(normalize_mac(mac))
+
+    def hosts(self, active: Optional[bool] = None) -> List[LanHost]:
+        """
+        Return the tracked hosts
+
+        active : `bool`, filter on the host state, optional
+            , Default to None
+        """
+        return [h for h in self._hosts.values() if active in (None, h.active)]
+
+    async def poll(self) -> List[Tuple[str, LanHost, Any]]:
+        """
+        Read the hosts of all interfaces and notify subscribers of the deltas
+
+        Returns the deltas
+        """
+
+        interfaces = [i["name"] for i in await self._lan.get_interfaces() or []]
+        host_lists = await asyncio.gather(
+            *[self._lan.get_hosts_list(i) for i in interfaces]
+        )
+
+        deltas: List[Tuple[str, LanHost, Any]] = []
+        seen = set()
+        for interface, hosts in zip(interfaces, host_lists):
+            for h in hosts or []:
+                seen.add(h["id"])
+                self._update(interface, h, deltas)
+        for host_id in [k for k in self._hosts if k not in seen]:
+            host = self._hosts.pop(host_id)
+            self._unindex(host)
+            if host.active:
+                host.active = False
+                deltas.append(("leave", host, None))
+
+        if deltas:
+            await self.notify(deltas)
+        return deltas
+
+    def _index(self, host: LanHost) -> None:
+        """Add a host to the mac and ip indexes"""
+
+        if host.mac:
+            self._by_mac[host.mac] = host
+        for ip in host.ips:
+            self._by_ip[ip] = host
+
+    def _unindex(self, host: LanHost) -> None:
+        """Remove a host from the mac and ip indexes"""
+
+        if self._by_mac.get(host.mac) is host:
+            del self._by_mac[host.mac]
+        for ip in host.ips:
+            if self._by_ip.get(ip) is host:
+                del self._by_ip[ip]
+
+    def _update(
+        self,
+        interface: str,
+        h: Dict[str, Any],
+        deltas: List[Tuple[str, LanHost, Any]],
+    ) -> None:
+        """Update the record of a host, appending its deltas"""
+
+        name = h.get("primary_name", "")
+        active = bool(h.get("active"))
+        ips = tuple(
+            sorted(
+                c["addr"]
+                for c in h.get("l3connectivities", [])
+                if c.get("active") and c.get("addr")
+            )
+        )
+        host = self._hosts.get(h["id"])
+        if host is None:
+            host = LanHost(
+                h["id"],
+                interface,
+                normalize_mac(h.get("l2ident", {}).get("id", "")),
+                name,
+                h.get("host_type", ""),
+                ips,
+                active,
+            )
+            self._hosts[host.id] = host
+            self._index(host)
+            if active:
+                deltas.append(("join", host, None))
+            return
+
+        if ips != host.ips:
+            self._unindex(host)
+            host.ips = ips
+            self._index(host)
+        host.interface = interface
+        host.host_type = h.get("host_type", host.host_type)
+        if name != host.name:
+            previous, host.name = host.name, name
+            deltas.append(("rename", host, previous))
+        if active != host.active:
+            host.active = active
+            deltas.append(("join" if active else "leave", host, None))
+
+
+def normalize_mac(mac: str) -> str:
+    """
+    Return mac in the upper case colon separated form
+
+    mac : `str`
+    """
+
+    digits = "".join(c for c in mac if c not in ":-. ").upper()
+    if len(digits) != 12:
+        return mac.upper()
+    return ":".join(digits[i : i + 2] for i in range(0, 12, 2))
@@ -1,7 +1,23 @@
-from typing import Any, Awaitable, Dict, List, Mapping, Optional, Union
-
+import asyncio
+import logging
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+
+from aiofreepybox._helpers import bounded_gather
 from aiofreepybox.access import Access
 
+_DEFAULT_PAGE_CONCURRENCY = 4
+_DEFAULT_PAGE_SIZE = 100
+_LOGGER = logging.getLogger(__name__)
+
 
 class Meta:
     """
@@ -259,6 +275,77 @@ class Meta:
         """
         return await self._access.get("meta/static/vod/services?join_app=1")
 
+    def iter_meta_diffusions(
+        self,
+        diffusions_filter: Optional[Mapping[str, str]] = None,
+        page_size: int = _DEFAULT_PAGE_SIZE,
+    ) -> "MetaPages":
+        """
+        Iterate over all meta diffusions
+
+        diffusions_filter : `dict`, optional
+            , Default to None
+        page_size : `int` , optional
+            , Default to _DEFAULT_PAGE_SIZE
+        """
+        query = {**(diffusions_filter or {}), "join_emission": "1"}
+        return MetaPages(self._access, "meta/static/epg/diffusions", query, page_size)
+
+    def iter_meta_emission_collections(
+        self, filter_emission_id: str, page_size: int = _DEFAULT_PAGE_SIZE
+    ) -> "MetaPages":
+        """
+        Iterate over all meta emission collections
+
+        filter_emission_id : `str`
+        page_size : `int` , optional
+            , Default to _DEFAULT_PAGE_SIZE
+        """
+        query = {"filter_emission_id": filter_emission_id}
+        return MetaPages(
+            self._access, "meta/static/plurimedia/collections", query, page_size
+        )
+
+    def iter_meta_emission_vod_entries(
+        self,
+        filter_plurimedia_emission_id: Optional[str] = None,
+        page_size: int = _DEFAULT_PAGE_SIZE,
+    ) -> "MetaPages":
+        """
+        Iterate over all meta emission vod entries
+
+        filter_plurimedia_emission_id : `str`, optional
+            , Default to None
+        page_size : `int` , optional
+            , Default to _DEFAULT_PAGE_SIZE
+        """
+        query: Optional[Mapping[str, str]] = {
+            "filter_plurimedia_emission_id": filter_plurimedia_emission_id
+        } if filter_plurimedia_emission_id is not None else None
+        return MetaPages(
+            self._access, "meta/static/vod/catalog/entries", query, page_size
+        )
+
+    def iter_meta_emissions(
+        self,
+        emissions_filter: Optional[Mapping[str, str]] = None,
+        page_size: int = _DEFAULT_PAGE_SIZE,
+    ) -> "MetaPages":
+        """
+        Iterate over all meta emissions
+
+        emissions_filter : `dict`, optional
+            , Default to None
+        page_size : `int` , optional
+            , Default to _DEFAULT_PAGE_SIZE
+        """
+        return MetaPages(
+            self._access,
+            "meta/static/plurimedia/emissions",
+            emissions_filter,
+            page_size,
+        )
+
     async def search_catchup(
         self, search_catchup_query: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
@@ -304,3 +391,114 @@ class Meta:
             "query": search_tv_channel_query
         } if search_tv_channel_query is not None else None
         return await self._access.get("meta/search/tv_channels", query)
+
+
+class MetaPages:
+    """
+    Paginated meta endpoint
+
+    Iterating yields the items of all pages, the next page is requested
+    while the items of the current one are consumed. Pages are requested
+    with ``offset`` and ``limit``, the offset is advanced by the number of
+    items received since the box may return less than limit items, and
+    the end is reached on the first empty page.
+
+    access : `Access`
+    path : `str`
+    query : `dict` or `None`
+    page_size : `int`
+    """
+
+    def __init__(
+        self,
+        access: Access,
+        path: str,
+        query: Optional[Mapping[str, str]],
+        page_size: int,
+    ) -> None:
+        self._access = access
+        self.path = path
+        self.query = dict(query or {})
+        self.page_size = max(1, page_size)
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._iter_items()
+
+    async def get_items(
+        self, offset: int, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get at most limit items from offset, in a single request
+
+        offset : `int`
+        limit : `int`, optional
+            , Default to page_size
+        """
+
+        query = {
+            **self.query,
+            "offset": str(offset),
+            "limit": str(self.page_size if limit is None else limit),
+        }
+        result = await self._access.get(self.path, query)
+        if isinstance(result, dict):
+            # An empty result has no items, any other one is unexpected
+            if result and "items" not in result:
+                _LOGGER.warning(f"{self.path} result has no items: {sorted(result)}")
+            result = result.get("items")
+        return result or []
+
+    async def get_page(self, page: int) -> List[Dict[str, Any]]:
+        """
+        Get the items of a page, more requests are made if the box
+        returns less than page_size items before the end
+
+        page : `int`, first page is 0
+        """
+
+        offset = page * self.page_size
+        end = offset + self.page_size
+        items: List[Dict[str, Any]] = []
+        while offset < end:
+            received = await self.get_items(offset, end - offset)
+            if not received:
+                break
+            items.extend(received)
+            offset += len(received)
+        return items
+
+    async def get_pages(
+        self, first: int, last: int, concurrency: int = _DEFAULT_PAGE_CONCURRENCY
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the items of a known page range, pages are requested
+        concurrently
+
+        first : `int`, first page
+        last : `int`, last page, included
+        concurrency : `int`, max pending requests, optional
+            , Default to _DEFAULT_PAGE_CONCURRENCY
+        """
+
+        pages = await bounded_gather(
+            [self.get_page(p) for p in range(first, last + 1)], concurrency
+        )
+        return [item for items in pages for item in items]
+
+    async def _iter_items(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the items of all pages, prefetching the next page"""
+
+        offset = 0
+        task = asyncio.ensure_future(self.get_items(offset))
+        try:
+            while True:
+                items = await task
+                if not items:
+                    return
+                offset += len(items)
+                task = asyncio.ensure_future(self.get_items(offset))
+                for item in items:
+                    yield item
+        finally:
+            if not task.done():
+                task.cancel()
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional, Union
 from aiohttp import client_exceptions as cl_ex
 
 from aiofreepybox.access import Access
+from aiofreepybox.mdns import FBX_PLAYER_SERVICES, MdnsBrowser
 
 _PL_LOCAL = "Freebox-Player.local"
 _PL_HOST = "freeboxhd"
@@ -14,6 +15,7 @@ _REMOTE_CONTROL = "/pub/remote_control"
 _DEFAULT_ACCESS_MODE = "local"
 _DEFAULT_DELAY = 1
 _DEFAULT_LONG_PRESS = "False"
+_DEFAULT_MDNS_TIMEOUT = 2.0
 _DEFAULT_PL_ID = 1
 _DEFAULT_REPEAT = 0
 _DEFAULT_TIMEOUT = 5
@@ -26,6 +28,7 @@ class Remote:
 
     def __init__(self, access: Access, access_m: Optional[str] = None) -> None:
         self._access = access
+        self._mdns = MdnsBrowser()
         self.set_player_host(access_m)
 
     codes = {
@@ -98,6 +101,26 @@ class Remote:
 
         return key_data
 
+    async def discover_player_host(
+        self, timeout: float = _DEFAULT_MDNS_TIMEOUT
+    ) -> Optional[str]:
+        """
+        Find a player with mDNS and use it as player host
+
+        timeout : `float`, optional
+            Default to _DEFAULT_MDNS_TIMEOUT
+
+        Returns the player host or `None` if no player answered
+        """
+
+        for service_type in FBX_PLAYER_SERVICES:
+            for svc in await self._mdns.browse(service_type, timeout):
+                if "FreeboxServer" in svc.device_type:
+                    continue
+                self.set_player_host("host", host=svc.host)
+                return self.player_host
+        return None
+
     async def send_key(
         self,
         code: str,
@@ -1,7 +1,28 @@
-from typing import Any, Dict, List, Optional
+from array import array
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
 
+from aiofreepybox._helpers import Poller, RingSeries
 from aiofreepybox.access import Access
 
+# 32 bits port counters
+_COUNTER_WRAP = 1 << 32
+_DEFAULT_SAMPLER_INTERVAL = 5.0
+_DEFAULT_SAMPLER_SIZE = 720
+
+# Error counters summed in the rx and tx error deltas
+_RX_ERRORS = (
+    "rx_err_packets",
+    "rx_fcs_packets",
+    "rx_fragments_packets",
+    "rx_jabber_packets",
+)
+_TX_ERRORS = ("tx_fcs", "tx_collisions", "tx_late", "tx_excessive")
+_BYTE_COUNTERS = ("rx_good_bytes", "tx_bytes")
+_COUNTERS = _BYTE_COUNTERS + _RX_ERRORS + _TX_ERRORS
+# Smallest ethernet frame, bounds the packet counters increase
+_MIN_FRAME_BYTES = 64
+
 
 class Switch:
     """
@@ -48,3 +69,143 @@ class Switch:
         port_id : `int`
         """
         return await self._access.get(f"switch/port/{port_id}/stats")
+
+    def sampler(
+        self,
+        interval: float = _DEFAULT_SAMPLER_INTERVAL,
+        size: int = _DEFAULT_SAMPLER_SIZE,
+    ) -> "PortSampler":
+        """
+        Return a sampler of the statistics of all switch ports
+
+        interval : `float`, poll interval
+            , Default to _DEFAULT_SAMPLER_INTERVAL
+        size : `int`, samples kept per port
+            , Default to _DEFAULT_SAMPLER_SIZE
+        """
+        return PortSampler(self, interval, size)
+
+
+class PortSampler(Poller):
+    """
+    Switch ports statistics sampler
+
+    The statistics of all ports are requested concurrently each interval.
+    Per-port rx/tx rates in bytes per second and rx/tx error deltas are
+    computed from the cumulative counters and stored in preallocated ring
+    buffers. A counter lower than its previous value is taken as a 32 bits
+    wraparound only if the wrapped increase fits in the port speed over the
+    elapsed time, else as a counter reset. Subscribers are called with the
+    new samples, as a `dict` of sample by port id.
+
+    switch : `Switch`
+    interval : `float`
+    size : `int`
+    """
+
+    _series_names = ("time", "rx_rate", "tx_rate", "rx_errors", "tx_errors")
+
+    def __init__(self, switch: Switch, interval: float, size: int) -> None:
+        super().__init__("Switch ports", interval)
+        self._switch = switch
+        self.size = size
+        self._ports: List[int] = []
+        self._speeds: Dict[int, int] = {}
+        self._series: Dict[int, RingSeries] = {}
+        # Last time and counters by port
+        self._last: Dict[int, Tuple[float, array]] = {}
+
+    def samples(self, port_id: int) -> Dict[str, List[float]]:
+        """
+        Return the samples of a port, oldest first
+
+        port_id : `int`
+
+        Returns a `dict` of lists: time, rx_rate, tx_rate, rx_errors, tx_errors
+        """
+
+        series = self._series.get(port_id)
+        return series.samples() if series is not None else {}
+
+    async def poll(self) -> None:
+        """
+        Read the statistics of all ports, append their samples and notify
+        subscribers of them
+        """
+
+        if not self._ports:
+            self._update_ports(await self._switch.get_status())
+            status = None
+            stats = await asyncio.gather(
+                *[self._switch.get_port_stats(p) for p in self._ports]
+            )
+        else:
+            # The status is read again for the link speeds
+            status, *stats = await asyncio.gather(
+                self._switch.get_status(),
+                *[self._switch.get_port_stats(p) for p in self._ports],
+            )
+        now = asyncio.get_event_loop().time()
+        samples: Dict[int, Dict[str, float]] = {}
+        for port_id, st in zip(self._ports, stats):
+            if not st:
+                continue
+            current = array("d", (st.get(k, 0) for k in _COUNTERS))
+            last = self._last.get(port_id)
+            self._last[port_id] = (now, current)
+            if last is None or now <= last[0]:
+                continue
+
+            elapsed = now - last[0]
+            # Link speed is in Mbit/s
+            max_bytes = self._speeds.get(port_id, 0) * 125000 * elapsed
+            max_packets = max_bytes / _MIN_FRAME_BYTES
+            deltas = {
+                k: _delta(old, new, max_bytes if k in _BYTE_COUNTERS else max_packets)
+                for k, old, new in zip(_COUNTERS, last[1], current)
+            }
+            samples[port_id] = {
+                "time": now,
+                "rx_rate": deltas["rx_good_bytes"] / elapsed,
+                "tx_rate": deltas["tx_bytes"] / elapsed,
+                "rx_errors": sum(deltas[k] for k in _RX_ERRORS),
+                "tx_errors": sum(deltas[k] for k in _TX_ERRORS),
+            }
+            self._series[port_id].append(samples[port_id])
+
+        if status is not None:
+            self._update_ports(status)
+        if samples:
+            await self.notify(samples)
+
+    def _update_ports(self, status: Optional[List[Dict[str, Any]]]) -> None:
+        """Update the port list and link speeds from the switch status"""
+
+        for p in status or []:
+            if p["id"] not in self._series:
+                self._ports.append(p["id"])
+                self._series[p["id"]] = RingSeries(self._series_names, self.size)
+            try:
+                self._speeds[p["id"]] = int(p.get("speed") or 0)
+            except ValueError:
+                self._speeds[p["id"]] = 0
+
+
+def _delta(old: float, new: float, limit: float) -> float:
+    """
+    Return the increase of a counter
+
+    A counter lower than its previous value wrapped around if it fits in
+    32 bits and the wrapped increase is at most limit, else it was reset.
+
+    old : `float`
+    new : `float`
+    limit : `float`, largest possible increase
+    """
+
+    if new >= old:
+        return new - old
+    wrapped = new + _COUNTER_WRAP - old
+    if old < _COUNTER_WRAP and wrapped <= limit:
+        return wrapped
+    return new
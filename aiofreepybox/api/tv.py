@@ -1,9 +1,12 @@
 import time
 from typing import Any, Dict, List, Optional
 
+from aiofreepybox._helpers import bounded_gather
 from aiofreepybox.access import Access
 
 _DEFAULT_BOUQUET = "freeboxtv"
+_DEFAULT_EPG_CONCURRENCY = 4
+_DEFAULT_EPG_STEP = 3600
 
 
 class Tv:
@@ -155,37 +158,86 @@ class Tv:
         return await self._access.get(f"tv/epg/programs/{program_id}")
 
     async def get_tv_program_highlights(
-        self, channel_id: int, date: int = int(time.time())
+        self, channel_id: int, date: Optional[int] = None
     ) -> Optional[List[Dict[str, Any]]]:
         """
         Get tv program highlights
 
         channel_id : `int`
-        date : `int`
+        date : `int` , optional
+            , Default to now
         """
+        date = int(time.time()) if date is None else date
         return await self._access.get(f"tv/epg/highlights/{channel_id}/{date}")
 
     async def get_tv_programs_by_channel(
-        self, channel_id: int, date: int = int(time.time())
+        self, channel_id: int, date: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Get tv programs by channel
 
         channel_id : `int`
-        date : `int`
+        date : `int` , optional
+            , Default to now
         """
+        date = int(time.time()) if date is None else date
         return await self._access.get(f"tv/epg/by_channel/{channel_id}/{date}")
 
     async def get_tv_programs_by_date(
-        self, date: int = int(time.time())
+        self, date: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Get tv programs by date
 
-        date : `int`
+        date : `int` , optional
+            , Default to now
         """
+        date = int(time.time()) if date is None else date
         return await self._access.get(f"tv/epg/by_time/{date}")
 
+    async def get_tv_programs_window(
+        self,
+        duration: int,
+        start: Optional[int] = None,
+        step: int = _DEFAULT_EPG_STEP,
+        concurrency: int = _DEFAULT_EPG_CONCURRENCY,
+    ) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get tv programs of all channels over a time window
+
+        The window is split in ``by_time`` requests every step seconds,
+        at most concurrency are pending. Programs returned by several
+        requests are merged on their id.
+
+        duration : `int`, window length in seconds
+        start : `int` , optional
+            , Default to now
+        step : `int` , optional
+            , Default to _DEFAULT_EPG_STEP
+        concurrency : `int` , optional
+            , Default to _DEFAULT_EPG_CONCURRENCY
+
+        Returns programs by id by channel uuid
+        """
+
+        start = int(time.time()) if start is None else start
+        results = await bounded_gather(
+            [
+                self.get_tv_programs_by_date(d)
+                for d in range(start, start + max(duration, 1), step)
+            ],
+            concurrency,
+        )
+        channels: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for r in results:
+            for channel, programs in (r or {}).items():
+                merged = channels.setdefault(channel, {})
+                if isinstance(programs, dict):
+                    programs = programs.values()
+                for p in programs:
+                    merged[p["id"]] = p
+        return channels
+
     async def get_tv_records_configuration(self) -> Optional[Dict[str, Any]]:
         """
         Get tv records configuration
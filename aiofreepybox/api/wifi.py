@@ -1,6 +1,25 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+from functools import partial
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
+from aiohttp import ClientError
+
+from aiofreepybox._helpers import Poller, RingSeries, bounded_gather
 from aiofreepybox.access import Access
+from aiofreepybox.api.lan import normalize_mac
+from aiofreepybox.exceptions import HttpRequestError
+
+_DEFAULT_HISTORY_INTERVAL = 10.0
+_DEFAULT_HISTORY_SIZE = 360
+_DEFAULT_SCAN_DEADLINE = 60.0
+_DEFAULT_SCAN_INTERVAL = 1.0
+_DEFAULT_SCAN_MAX_INTERVAL = 8.0
+_DEFAULT_SCAN_MIN_WAIT = 10.0
+_DEFAULT_SCAN_STABLE = 2
+_DEFAULT_SYNC_CONCURRENCY = 8
+_HISTORY_SERIES = ("time", "ap_id", "signal", "rx_bps", "tx_bps")
+_LOGGER = logging.getLogger(__name__)
 
 
 class Wifi:
@@ -114,6 +133,24 @@ class Wifi:
         """
         return await self._access.get(f"wifi/ap/{ap_id}")
 
+    async def get_all_stations(self) -> List[Dict[str, Any]]:
+        """
+        Get the stations of all access points, stations of each access point
+        are requested concurrently
+
+        Returns the stations with ``ap_id`` and ``band`` of their access point
+        """
+
+        aps = await self.get_ap_list() or []
+        station_lists = await asyncio.gather(
+            *[self.get_station_list(ap["id"]) for ap in aps]
+        )
+        return [
+            dict(s, ap_id=ap["id"], band=ap.get("config", {}).get("band"))
+            for ap, stations in zip(aps, station_lists)
+            for s in stations or []
+        ]
+
     async def get_ap_allowed_channel(
         self, ap_id: int
     ) -> Optional[List[Dict[str, Any]]]:
@@ -243,6 +280,21 @@ class Wifi:
         """
         return await self._access.put("wifi/planning/", wifi_planning)
 
+    def station_history(
+        self,
+        interval: float = _DEFAULT_HISTORY_INTERVAL,
+        size: int = _DEFAULT_HISTORY_SIZE,
+    ) -> "StationHistory":
+        """
+        Return a rolling history of the stations of all access points
+
+        interval : `float`, poll interval
+            , Default to _DEFAULT_HISTORY_INTERVAL
+        size : `int`, samples kept per station
+            , Default to _DEFAULT_HISTORY_SIZE
+        """
+        return StationHistory(self, interval, size)
+
     async def start_wifi_access_point_neighbors_scan(self, ap_id: int) -> None:
         """
         Start wifi access point neighbors scan
@@ -251,6 +303,110 @@ class Wifi:
         """
         await self._access.post(f"wifi/ap/{ap_id}/neighbors/scan/")
 
+    async def scan_neighbors(
+        self,
+        interval: float = _DEFAULT_SCAN_INTERVAL,
+        max_interval: float = _DEFAULT_SCAN_MAX_INTERVAL,
+        deadline: float = _DEFAULT_SCAN_DEADLINE,
+        stable: int = _DEFAULT_SCAN_STABLE,
+        min_wait: float = _DEFAULT_SCAN_MIN_WAIT,
+    ) -> Dict[str, Any]:
+        """
+        Scan the neighbors of all access points and wait for the results
+
+        Scans are started on all access points concurrently, neighbors of
+        the access points whose scan started are then polled backing off
+        exponentially from interval to max_interval until the seen bssids
+        did not change for stable polls in a row, or the deadline is
+        reached. Since the previous results are returned until a scan
+        completes, seen bssids are only taken as stable once they differ
+        from the ones before the scan or after min_wait seconds.
+
+        interval : `float` , optional
+            , Default to _DEFAULT_SCAN_INTERVAL
+        max_interval : `float` , optional
+            , Default to _DEFAULT_SCAN_MAX_INTERVAL
+        deadline : `float` , optional
+            , Default to _DEFAULT_SCAN_DEADLINE
+        stable : `int` , optional
+            , Default to _DEFAULT_SCAN_STABLE
+        min_wait : `float` , optional
+            , Default to _DEFAULT_SCAN_MIN_WAIT
+
+        Returns a `dict` with:
+            neighbors       neighbors by bssid, with the strongest signal seen
+                            and the ``ap_ids`` which saw them
+            channel_usage   channel usage by band and channel, with ``ap_id``
+            errors          scan start error by ``ap_id``
+        """
+
+        aps = await self.get_ap_list() or []
+        ap_ids = [ap["id"] for ap in aps]
+        # Neighbors before the scan, returned until a new scan completes
+        pre_scan = await asyncio.gather(*[self.get_ap_neighbors(i) for i in ap_ids])
+        before_lists = dict(zip(ap_ids, pre_scan))
+        started = await asyncio.gather(
+            *[self.start_wifi_access_point_neighbors_scan(i) for i in ap_ids],
+            return_exceptions=True,
+        )
+        errors: Dict[Any, Exception] = {}
+        for ap_id, r in zip(ap_ids, started):
+            if isinstance(r, (ClientError, HttpRequestError)):
+                _LOGGER.warning(f"Wifi scan of access point {ap_id} failed: {str(r)}")
+                errors[ap_id] = r
+            elif isinstance(r, BaseException):
+                raise r
+        ap_ids = [i for i in ap_ids if i not in errors]
+        before = _seen_bssids(ap_ids, [before_lists[i] for i in ap_ids])
+
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        end = start + deadline
+        previous: Optional[frozenset] = None
+        changed = False
+        unchanged = 0
+        lists: List[Any] = []
+        while ap_ids:
+            await asyncio.sleep(max(0.0, min(interval, end - loop.time())))
+            lists = await asyncio.gather(*[self.get_ap_neighbors(i) for i in ap_ids])
+            seen = _seen_bssids(ap_ids, lists)
+            changed = changed or seen != before
+            unchanged = unchanged + 1 if seen == previous else 0
+            previous = seen
+            now = loop.time()
+            if (changed or now - start >= min_wait) and unchanged + 1 >= stable:
+                break
+            if now >= end:
+                break
+            interval = min(interval * 2, max_interval)
+
+        neighbors: Dict[str, Dict[str, Any]] = {}
+        for ap_id, neighbor_list in zip(ap_ids, lists):
+            for n in neighbor_list or []:
+                known = neighbors.get(n.get("bssid"))
+                if known is None:
+                    neighbors[n.get("bssid")] = dict(n, ap_ids=[ap_id])
+                    continue
+                known["ap_ids"].append(ap_id)
+                if n.get("signal", -1000) > known.get("signal", -1000):
+                    known.update(n, ap_ids=known["ap_ids"])
+
+        usage_lists = await asyncio.gather(
+            *[self.get_wifi_access_point_channel_usage(i) for i in ap_ids]
+        )
+        channel_usage: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        for ap_id, usage in zip(ap_ids, usage_lists):
+            for u in usage or []:
+                channel_usage.setdefault(
+                    (u.get("band"), u.get("channel")), dict(u, ap_id=ap_id)
+                )
+
+        return {
+            "neighbors": list(neighbors.values()),
+            "channel_usage": list(channel_usage.values()),
+            "errors": errors,
+        }
+
     async def start_wps_session(
         self, start_wps_session_data: Dict[str, Any]
     ) -> Optional[int]:
@@ -269,6 +425,99 @@ class Wifi:
         """
         await self._access.post("wifi/wps/stop/", stop_wps_session_data)
 
+    async def sync_custom_keys(
+        self,
+        desired: List[Dict[str, Any]],
+        concurrency: int = _DEFAULT_SYNC_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Make the wifi custom keys match desired
+
+        Keys are matched on their ``key`` value, keys whose given params
+        differ are deleted and created again as they can not be edited,
+        keys missing from desired are deleted. Running it again once
+        applied issues no request.
+
+        desired : `list` of custom key params `dict`
+        concurrency : `int`, max pending requests, optional
+            , Default to _DEFAULT_SYNC_CONCURRENCY
+
+        Returns the results by entry: `dict` with action, entry and error
+        """
+
+        current = {
+            k["params"]["key"]: k for k in await self.get_wifi_custom_keys() or []
+        }
+        wanted = {p["key"]: p for p in desired}
+        stale = {
+            key
+            for key, k in current.items()
+            if key not in wanted
+            or any(k["params"].get(f) != v for f, v in wanted[key].items())
+        }
+        deletes = [
+            (
+                "delete",
+                current[key]["params"],
+                partial(self.delete_wifi_custom_key, current[key]["id"]),
+            )
+            for key in stale
+        ]
+        # Deletes go first, a recreated key must not exist anymore
+        results = await self._sync_apply(deletes, concurrency)
+        failed = {r["entry"]["key"] for r in results if r["error"] is not None}
+        creates = [
+            ("create", params, partial(self.create_wifi_custom_key, {"params": params}))
+            for key, params in wanted.items()
+            if (key not in current or key in stale) and key not in failed
+        ]
+        return results + await self._sync_apply(creates, concurrency)
+
+    async def sync_mac_filters(
+        self,
+        desired: List[Dict[str, Any]],
+        concurrency: int = _DEFAULT_SYNC_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Make the wifi mac filters match desired
+
+        Filters are matched on their normalized mac and type, filters whose
+        comment differs are edited, filters missing from desired are deleted.
+        Running it again once applied issues no request.
+
+        desired : `list` of mac filter `dict`, see wifi_mac_filter_schema
+        concurrency : `int`, max pending requests, optional
+            , Default to _DEFAULT_SYNC_CONCURRENCY
+
+        Returns the results by entry: `dict` with action, entry and error
+        """
+
+        current = {
+            (normalize_mac(f["mac"]), f["type"]): f
+            for f in await self.get_wifi_mac_filters() or []
+        }
+        wanted = {(normalize_mac(f["mac"]), f["type"]): f for f in desired}
+        ops: List[Tuple[str, Dict[str, Any], Callable[[], Awaitable[Any]]]] = []
+        for key, f in current.items():
+            if key not in wanted:
+                ops.append(("delete", f, partial(self.delete_wifi_mac_filter, f["id"])))
+        for key, f in wanted.items():
+            if key not in current:
+                ops.append(("create", f, partial(self.create_wifi_mac_filter, f)))
+            elif current[key].get("comment", "") != f.get("comment", ""):
+                ops.append(
+                    (
+                        "edit",
+                        f,
+                        partial(
+                            self.edit_wifi_mac_filter,
+                            current[key]["id"],
+                            {"comment": f.get("comment", "")},
+                        ),
+                    )
+                )
+        return await self._sync_apply(ops, concurrency)
+
     async def wifi_switch(self, enabled: Optional[bool] = None) -> Optional[bool]:
         """
         Wifi switch
@@ -289,3 +538,124 @@ class Wifi:
             return config["enabled"]
         else:
             return None
+
+    async def _sync_apply(
+        self,
+        ops: List[Tuple[str, Dict[str, Any], Callable[[], Awaitable[Any]]]],
+        concurrency: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run sync operations concurrently, at most concurrency at a time
+
+        ops : `list` of (action, entry, request factory)
+        concurrency : `int`
+        """
+
+        async def apply(
+            action: str, entry: Dict[str, Any], request: Callable[[], Awaitable[Any]]
+        ) -> Dict[str, Any]:
+            try:
+                await request()
+            except (ClientError, HttpRequestError) as e:
+                _LOGGER.warning(f"Wifi sync {action} failed: {str(e)}")
+                return {"action": action, "entry": entry, "error": e}
+            return {"action": action, "entry": entry, "error": None}
+
+        return await bounded_gather([apply(*op) for op in ops], concurrency)
+
+
+class StationHistory(Poller):
+    """
+    Rolling wifi stations history
+
+    Each poll appends a sample per station to fixed-size ring buffers:
+    time, access point id, signal and rx/tx throughput in bytes per second,
+    computed from the byte counters of consecutive samples. Stations not
+    seen for size polls are dropped. Subscribers are called with the new
+    samples, as a `dict` of sample by station mac.
+
+    wifi : `Wifi`
+    interval : `float`
+    size : `int`
+    """
+
+    def __init__(self, wifi: Wifi, interval: float, size: int) -> None:
+        super().__init__("Wifi stations", interval)
+        self._wifi = wifi
+        self.size = size
+        self._series: Dict[str, RingSeries] = {}
+        self._last: Dict[str, Tuple[float, int, int]] = {}
+        # Poll count and last poll each station was seen at
+        self._polls = 0
+        self._seen: Dict[str, int] = {}
+
+    def history(self, mac: str) -> Dict[str, List[Any]]:
+        """
+        Return the samples of a station, oldest first
+
+        mac : `str`
+
+        Returns a `dict` of lists: time, ap_id, signal, rx_bps, tx_bps
+        """
+
+        series = self._series.get(normalize_mac(mac))
+        return series.samples() if series is not None else {}
+
+    def stations(self) -> List[str]:
+        """
+        Return the mac addresses of the stations seen
+        """
+        return list(self._series)
+
+    async def poll(self) -> List[Dict[str, Any]]:
+        """
+        Read the stations of all access points, append their samples and
+        notify subscribers of them
+
+        Returns the stations
+        """
+
+        stations = await self._wifi.get_all_stations()
+        now = asyncio.get_event_loop().time()
+        self._polls += 1
+        samples: Dict[str, Dict[str, Any]] = {}
+        for s in stations:
+            mac = normalize_mac(s["mac"])
+            self._seen[mac] = self._polls
+            rx, tx = s.get("rx_bytes", 0), s.get("tx_bytes", 0)
+            rx_bps = tx_bps = 0.0
+            last = self._last.get(mac)
+            # Counters are reset when the station reassociates
+            if last is not None and now > last[0] and rx >= last[1] and tx >= last[2]:
+                rx_bps = (rx - last[1]) / (now - last[0])
+                tx_bps = (tx - last[2]) / (now - last[0])
+            self._last[mac] = (now, rx, tx)
+
+            if mac not in self._series:
+                self._series[mac] = RingSeries(
+                    _HISTORY_SERIES, self.size, {"ap_id": "i"}
+                )
+            samples[mac] = {
+                "time": now,
+                "ap_id": s["ap_id"],
+                "signal": s.get("signal", 0),
+                "rx_bps": rx_bps,
+                "tx_bps": tx_bps,
+            }
+            self._series[mac].append(samples[mac])
+
+        for mac in [m for m, p in self._seen.items() if self._polls - p >= self.size]:
+            del self._series[mac], self._last[mac], self._seen[mac]
+        if samples:
+            await self.notify(samples)
+        return stations
+
+
+def _seen_bssids(ap_ids: List[Any], lists: List[Any]) -> frozenset:
+    """Return the (ap_id, bssid) pairs of neighbor lists"""
+
+    return frozenset(
+        (ap_id, n.get("bssid"))
+        for ap_id, neighbors in zip(ap_ids, lists)
+        for n in neighbors or []
+    )
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+from urllib.parse import urljoin
+
+from aiohttp.client import ClientSession
+
+from aiofreepybox.exceptions import AuthorizationError
+
+_DEFAULT_DEADLINE = 300
+_DEFAULT_ERR = "Error: "
+_DEFAULT_INTERVAL = 0.5
+_DEFAULT_MAX_INTERVAL = 4
+_DEFAULT_TIMEOUT = 10
+_LOGGER = logging.getLogger(__name__)
+
+
+class Authorization:
+    """
+    Application authorization flow
+
+    Polls the authorization status of an application token request,
+    backing off exponentially from interval to max_interval, until the
+    user accepts or denies it on the freebox or the deadline is reached.
+
+    session : `ClientSession`
+    base_url : `str`
+    track_id : `str`
+    timeout : `int` , optional
+        , Default to _DEFAULT_TIMEOUT
+    interval : `float` , optional
+        , Default to _DEFAULT_INTERVAL
+    max_interval : `float` , optional
+        , Default to _DEFAULT_MAX_INTERVAL
+    deadline : `float` , optional
+        , Default to _DEFAULT_DEADLINE
+    on_pending : `callable`, optional
+        , called once with this object when user action is required,
+        may be a coroutine function. Default to a log warning
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        base_url: str,
+        track_id: str,
+        timeout: int = _DEFAULT_TIMEOUT,
+        interval: float = _DEFAULT_INTERVAL,
+        max_interval: float = _DEFAULT_MAX_INTERVAL,
+        deadline: float = _DEFAULT_DEADLINE,
+        on_pending: Optional[Callable[["Authorization"], Any]] = None,
+    ) -> None:
+        self.session = session
+        self.base_url = base_url
+        self.track_id = track_id
+        self.timeout = timeout
+        self.interval = interval
+        self.max_interval = max_interval
+        self.deadline = deadline
+        self.on_pending = on_pending
+        self.status: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._cancelled = False
+
+    def cancel(self) -> bool:
+        """
+        Cancel a running wait, which raises `AuthorizationError`
+
+        Returns `True` if a wait was cancelled
+        """
+
+        if self._task is None or self._task.done():
+            return False
+        self._cancelled = True
+        return self._task.cancel()
+
+    async def get_status(self) -> str:
+        """
+        Get authorization status of the application token
+
+        Returns:
+            unknown     the app_token is invalid or has been revoked
+            pending     the user has not confirmed the authorization request yet
+            timeout     the user did not confirmed the authorization within the given time
+            granted     the app_token is valid and can be used to open a session
+            denied      the user denied the authorization request
+        """
+
+        url = urljoin(self.base_url, f"login/authorize/{self.track_id}")
+        async with self.session.get(
+            url, timeout=self.timeout, skip_auto_headers=["User-Agent"]
+        ) as r:
+            resp = await r.json()
+            return resp["result"]["status"]
+
+    async def wait(self) -> str:
+        """
+        Wait until the authorization is granted
+
+        Raises `AuthorizationError` if it is denied, timed out, unknown,
+        still pending at the deadline or cancelled
+        """
+
+        # Polling runs in its own task so cancel only stops this wait
+        self._cancelled = False
+        self._task = asyncio.ensure_future(self._poll())
+        try:
+            return await self._task
+        except asyncio.CancelledError:
+            if not self._cancelled:
+                raise
+            raise AuthorizationError(
+                f"{_DEFAULT_ERR}Authorization cancelled."
+            ) from None
+
+    async def _poll(self) -> str:
+        """Poll the status until it is final or the deadline is reached"""
+
+        loop = asyncio.get_event_loop()
+        end = loop.time() + self.deadline
+        interval = self.interval
+        notified = False
+        while True:
+            self.status = await self.get_status()
+
+            if self.status == "granted":
+                _LOGGER.info("Application authorization granted.")
+                return self.status
+
+            # denied status = authorization failed
+            elif self.status in ("denied", "unknown"):
+                raise AuthorizationError(
+                    f"{_DEFAULT_ERR}The app token is invalid or has been revoked."
+                )
+
+            # timeout = authorization failed
+            elif self.status == "timeout":
+                raise AuthorizationError(f"{_DEFAULT_ERR}Authorization timed out.")
+
+            # Pending status : user must accept the app request on the freebox
+            if not notified:
+                notified = True
+                await self._notify_pending()
+
+            remaining = end - loop.time()
+            if remaining <= 0:
+                raise AuthorizationError(
+                    f"{_DEFAULT_ERR}Authorization still pending after {self.deadline}s."
+                )
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.max_interval)
+
+    async def _notify_pending(self) -> None:
+        """Notify that user action is required"""
+
+        if self.on_pending is None:
+            _LOGGER.warning("Please confirm the authentification on the freebox.")
+            return
+        r = self.on_pending(self)
+        if asyncio.iscoroutine(r):
+            await r
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from aiofreepybox.exceptions import NotOpenError
+from aiofreepybox.store import STORE_CHANNELS
+
+# Bump when the stored entry layout changes
+_CHANNELS_VERSION = 1
+_DEFAULT_BOUQUET = "freeboxtv"
+_DEFAULT_CHANNELS_TTL = 24 * 3600
+_DEFAULT_ERR = "Error: "
+
+
+class ChannelRegistry:
+    """
+    Tv channels registry
+
+    Channels and their bouquet numbers are fetched once and indexed by uuid,
+    number and name. They are persisted in the freebox store with a version
+    stamp and the fetch time, a stored entry with another version or older
+    than ttl is fetched again. Lookups do not issue any request.
+
+    fbx : `Freepybox`
+    ttl : `float`, seconds, optional
+        , Default to _DEFAULT_CHANNELS_TTL
+    bouquet_id : `str`, optional
+        , Default to _DEFAULT_BOUQUET
+    """
+
+    def __init__(
+        self,
+        fbx: Any,
+        ttl: float = _DEFAULT_CHANNELS_TTL,
+        bouquet_id: str = _DEFAULT_BOUQUET,
+    ) -> None:
+        self._fbx = fbx
+        self.ttl = ttl
+        self.bouquet_id = bouquet_id
+        self.channels: Dict[str, Dict[str, Any]] = {}
+        self.fetched: Optional[float] = None
+        self._by_name: Dict[str, str] = {}
+        self._by_number: Dict[int, str] = {}
+
+    def by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get channel by name or short name, case insensitive
+
+        name : `str`
+        """
+        uuid = self._by_name.get(name.casefold())
+        return self.channels[uuid] if uuid is not None else None
+
+    def by_number(self, number: int) -> Optional[Dict[str, Any]]:
+        """
+        Get channel by bouquet number
+
+        number : `int`
+        """
+        uuid = self._by_number.get(number)
+        return self.channels[uuid] if uuid is not None else None
+
+    def by_uuid(self, uuid: str) -> Optional[Dict[str, Any]]:
+        """
+        Get channel by uuid
+
+        uuid : `str`
+        """
+        return self.channels.get(uuid)
+
+    async def load(self, refresh: bool = False) -> None:
+        """
+        Load the channels from the store, fetching them if the stored
+        entry is missing, outdated or refresh is set
+
+        refresh : `bool`, optional
+            , Default to False
+        """
+
+        uid = self._fbx.fbx_uid
+        if not uid:
+            raise NotOpenError(f"{_DEFAULT_ERR}Freebox is not open")
+        entry = None
+        if not refresh:
+            entry = await self._fbx.read_store(STORE_CHANNELS, uid)
+        if (
+            entry is None
+            or entry.get("version") != _CHANNELS_VERSION
+            or entry.get("bouquet_id") != self.bouquet_id
+            or time.time() - entry.get("time", 0) > self.ttl
+        ):
+            entry = await self._fetch()
+            await self._fbx.write_store(STORE_CHANNELS, uid, entry)
+        self._index(entry)
+
+    async def _fetch(self) -> Dict[str, Any]:
+        """Fetch the channels and their bouquet numbers"""
+
+        channels, numbers = await asyncio.gather(
+            self._fbx.tv.get_tv_channels(),
+            self._fbx.tv.get_tv_bouquet_channels(self.bouquet_id),
+        )
+        channels = {uuid: dict(c) for uuid, c in (channels or {}).items()}
+        # Main numbers first, sub numbers are alternate versions of a channel
+        bouquet: List[Dict[str, Any]] = sorted(
+            numbers or [], key=lambda n: n.get("sub_number", 0)
+        )
+        for n in bouquet:
+            c = channels.get(n.get("uuid"))
+            if c is not None and "number" not in c:
+                c["number"] = n.get("number")
+        return {
+            "version": _CHANNELS_VERSION,
+            "bouquet_id": self.bouquet_id,
+            "time": time.time(),
+            "channels": channels,
+        }
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        """Build the indexes of a stored entry"""
+
+        self.channels = entry["channels"]
+        self.fetched = entry["time"]
+        self._by_name = {}
+        self._by_number = {}
+        for uuid, c in self.channels.items():
+            for name in (c.get("short_name"), c.get("name")):
+                if name:
+                    self._by_name[name.casefold()] = uuid
+            if c.get("number") is not None:
+                self._by_number[c["number"]] = uuid
@@ -0,0 +1,213 @@
+import asyncio
+from bisect import bisect_left
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import unicodedata
+
+_DEFAULT_EPG_CONCURRENCY = 4
+_DEFAULT_EPG_STEP = 3600
+_DEFAULT_EPG_WINDOW = 48 * 3600
+
+# Program fields the indexes are built from
+_INDEXED = ("channel", "date", "duration", "title")
+_WORD = re.compile(r"\w+")
+
+
+class EpgStore:
+    """
+    Local tv program guide
+
+    Programs of all channels are prefetched over a window, with at most
+    concurrency pending ``by_time`` requests, and indexed by channel,
+    by start time and by title words. Lookups are answered from the indexes
+    without any request.
+
+    fbx : `Freepybox`
+    window : `int`, seconds prefetched from the start time
+        , Default to _DEFAULT_EPG_WINDOW
+    step : `int`, seconds between two ``by_time`` requests
+        , Default to _DEFAULT_EPG_STEP
+    concurrency : `int`, max pending requests
+        , Default to _DEFAULT_EPG_CONCURRENCY
+    """
+
+    def __init__(
+        self,
+        fbx: Any,
+        window: int = _DEFAULT_EPG_WINDOW,
+        step: int = _DEFAULT_EPG_STEP,
+        concurrency: int = _DEFAULT_EPG_CONCURRENCY,
+    ) -> None:
+        self._fbx = fbx
+        self.window = window
+        self.step = step
+        self.concurrency = concurrency
+        self.channels: Dict[str, Dict[str, Any]] = {}
+        self.programs: Dict[str, Dict[str, Any]] = {}
+        self._by_channel: Dict[str, List[Tuple[int, str]]] = {}
+        self._by_time: List[Tuple[int, str]] = []
+        self._words: Dict[str, Set[str]] = {}
+        self._max_duration = 0
+        self._sorted = True
+
+    def __len__(self) -> int:
+        return len(self.programs)
+
+    def add(self, programs: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add programs to the store, known programs are replaced
+
+        programs : `iterable` of program `dict` with a ``channel`` uuid
+
+        Returns the number of new programs
+        """
+
+        new = 0
+        for p in programs:
+            program_id = p["id"]
+            known = self.programs.get(program_id)
+            self.programs[program_id] = p
+            if known is None:
+                new += 1
+            elif all(known.get(k) == p.get(k) for k in _INDEXED):
+                continue
+            else:
+                self._unindex(known)
+            key = (p.get("date", 0), program_id)
+            self._by_channel.setdefault(p.get("channel", ""), []).append(key)
+            self._by_time.append(key)
+            self._max_duration = max(self._max_duration, p.get("duration", 0))
+            for word in _words(p.get("title", "")):
+                self._words.setdefault(word, set()).add(program_id)
+        self._sorted = False
+        return new
+
+    def between(
+        self, start: int, end: int, channel: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the programs airing between start and end, by start time
+
+        start : `int`, unix timestamp
+        end : `int`, unix timestamp
+        channel : `str`, channel uuid, optional
+            , Default to all channels
+        """
+
+        self._sort()
+        index = self._by_time if channel is None else self._by_channel.get(channel, [])
+        # Programs started up to the longest duration before start may still air
+        lo = bisect_left(index, (start - self._max_duration,))
+        hi = bisect_left(index, (end,))
+        programs = []
+        for _, program_id in index[lo:hi]:
+            p = self.programs[program_id]
+            if p.get("date", 0) + p.get("duration", 0) > start:
+                programs.append(p)
+        return programs
+
+    def by_channel(self, channel: str) -> List[Dict[str, Any]]:
+        """
+        Return the programs of a channel, by start time
+
+        channel : `str`, channel uuid
+        """
+
+        self._sort()
+        return [self.programs[i] for _, i in self._by_channel.get(channel, [])]
+
+    def on_air(self, at: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the programs on air by channel
+
+        at : `int`, unix timestamp, optional
+            , Default to now
+        """
+
+        at = int(time.time()) if at is None else at
+        return {p.get("channel", ""): p for p in self.between(at, at + 1)}
+
+    async def prefetch(self, start: Optional[int] = None) -> int:
+        """
+        Fetch the channels and the programs of the window
+
+        start : `int`, unix timestamp, optional
+            , Default to now
+
+        Returns the number of new programs
+        """
+
+        self.channels, programs = await asyncio.gather(
+            self._fbx.tv.get_tv_channels(),
+            self._fbx.tv.get_tv_programs_window(
+                self.window, start, self.step, self.concurrency
+            ),
+        )
+        self.channels = self.channels or {}
+        return self.add(
+            dict(p, channel=channel)
+            for channel, by_id in programs.items()
+            for p in by_id.values()
+        )
+
+    def program(self, program_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get program
+
+        program_id : `str`
+        """
+        return self.programs.get(program_id)
+
+    def search(
+        self, query: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the programs whose title has all the words of query,
+        by start time
+
+        query : `str`
+        start : `int`, unix timestamp, optional
+            , Default to None
+        end : `int`, unix timestamp, optional
+            , Default to None
+        """
+
+        sets = [self._words.get(w, set()) for w in _words(query)]
+        if not sets:
+            return []
+        ids = set.intersection(*sorted(sets, key=len))
+        programs = sorted(
+            (self.programs[i] for i in ids), key=lambda p: p.get("date", 0)
+        )
+        return [
+            p
+            for p in programs
+            if (end is None or p.get("date", 0) < end)
+            and (start is None or p.get("date", 0) + p.get("duration", 0) > start)
+        ]
+
+    def _sort(self) -> None:
+        """Sort the time indexes after additions"""
+
+        if not self._sorted:
+            self._by_time.sort()
+            for index in self._by_channel.values():
+                index.sort()
+            self._sorted = True
+
+    def _unindex(self, p: Dict[str, Any]) -> None:
+        """Remove a program from the indexes"""
+
+        key = (p.get("date", 0), p["id"])
+        self._by_time.remove(key)
+        self._by_channel[p.get("channel", "")].remove(key)
+        for word in _words(p.get("title", "")):
+            self._words[word].discard(p["id"])
+
+
+def _words(text: str) -> Set[str]:
+    """Return the lower case words of text, without accents"""
+
+    text = unicodedata.normalize("NFKD", text.lower())
+    return set(_WORD.findall("".join(c for c in text if not unicodedata.combining(c))))
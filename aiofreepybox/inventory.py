@@ -0,0 +1,197 @@
+import asyncio
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from aiofreepybox.api.lan import normalize_mac
+
+_DEFAULT_TTL = 30.0
+
+# Inventory sources
+SOURCE_LAN = "lan"
+SOURCE_DHCP_DYNAMIC = "dhcp_dynamic"
+SOURCE_DHCP_STATIC = "dhcp_static"
+SOURCE_WIFI = "wifi"
+SOURCES = (SOURCE_LAN, SOURCE_DHCP_DYNAMIC, SOURCE_DHCP_STATIC, SOURCE_WIFI)
+
+# Columns filled by each source, with their field extractor
+_COLUMNS: Dict[str, Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...]] = {
+    SOURCE_LAN: (
+        ("name", lambda h: h.get("primary_name")),
+        ("host_type", lambda h: h.get("host_type")),
+        ("vendor", lambda h: h.get("vendor_name")),
+        ("interface", lambda h: h.get("interface")),
+        ("active", lambda h: h.get("active")),
+        (
+            "lan_ips",
+            lambda h: tuple(
+                c["addr"]
+                for c in h.get("l3connectivities", [])
+                if c.get("active") and c.get("addr")
+            ),
+        ),
+    ),
+    SOURCE_DHCP_DYNAMIC: (
+        ("lease_ip", lambda d: d.get("ip")),
+        ("lease_hostname", lambda d: d.get("hostname")),
+        ("lease_assign_time", lambda d: d.get("assign_time")),
+    ),
+    SOURCE_DHCP_STATIC: (
+        ("static_ip", lambda d: d.get("ip")),
+        ("static_comment", lambda d: d.get("comment")),
+    ),
+    SOURCE_WIFI: (
+        ("ap_id", lambda s: s.get("ap_id")),
+        ("band", lambda s: s.get("band")),
+        ("signal", lambda s: s.get("signal")),
+        ("tx_rate", lambda s: s.get("tx_rate")),
+        ("rx_rate", lambda s: s.get("rx_rate")),
+    ),
+}
+
+
+class Inventory:
+    """
+    Device inventory
+
+    LAN hosts, DHCP dynamic and static leases and Wi-Fi stations are
+    fetched concurrently and hash-joined on normalized mac address into a
+    columnar table: ``macs`` holds the row keys and ``columns`` one list
+    per field, aligned on ``macs``.
+
+    Each source is fetched again only once its ttl expired, and only the
+    columns of the sources whose values changed are rebuilt.
+
+    fbx : `Freepybox`
+    ttls : `dict`, ttl in seconds by source, optional
+        , Default to _DEFAULT_TTL for every source
+    """
+
+    def __init__(self, fbx: Any, ttls: Optional[Dict[str, float]] = None) -> None:
+        self._fbx = fbx
+        self.ttls = {s: _DEFAULT_TTL for s in SOURCES}
+        self.ttls.update(ttls or {})
+        self.macs: List[str] = []
+        self.columns: Dict[str, List[Any]] = {
+            c: [] for s in SOURCES for c, _ in _COLUMNS[s]
+        }
+        self._indexes: Dict[str, Dict[str, Tuple[Any, ...]]] = {}
+        self._rows: Dict[str, int] = {}
+        self._times: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.macs)
+
+    def row(self, mac: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a device row
+
+        mac : `str`
+        """
+
+        mac = normalize_mac(mac)
+        i = self._rows.get(mac)
+        if i is None:
+            return None
+        row = {c: col[i] for c, col in self.columns.items()}
+        row["mac"] = mac
+        return row
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over device rows
+        """
+
+        for i, mac in enumerate(self.macs):
+            row = {c: col[i] for c, col in self.columns.items()}
+            row["mac"] = mac
+            yield row
+
+    async def refresh(self, force: bool = False) -> List[str]:
+        """
+        Fetch the expired sources and update the table
+
+        force : `bool`, fetch all sources, optional
+            , Default to False
+
+        Returns the sources whose values changed
+        """
+
+        now = asyncio.get_event_loop().time()
+        sources = [
+            s
+            for s in SOURCES
+            if force or s not in self._times or now - self._times[s] >= self.ttls[s]
+        ]
+        if not sources:
+            return []
+
+        fetched = await asyncio.gather(*[self._fetch(s) for s in sources])
+        changed = []
+        for source, records in zip(sources, fetched):
+            self._times[source] = now
+            index = self._index(source, records)
+            if index != self._indexes.get(source):
+                self._indexes[source] = index
+                changed.append(source)
+
+        if changed:
+            self._join(changed)
+        return changed
+
+    def _index(
+        self, source: str, records: List[Dict[str, Any]]
+    ) -> Dict[str, Tuple[Any, ...]]:
+        """Hash records of a source by normalized mac"""
+
+        mac_field: Callable[[Dict[str, Any]], str] = (
+            (lambda r: r.get("l2ident", {}).get("id", ""))
+            if source == SOURCE_LAN
+            else (lambda r: r.get("mac", ""))
+        )
+        index = {}
+        for r in records:
+            mac = mac_field(r)
+            if mac:
+                index[normalize_mac(mac)] = tuple(f(r) for _, f in _COLUMNS[source])
+        return index
+
+    def _join(self, changed: List[str]) -> None:
+        """Rebuild the columns of the changed sources"""
+
+        macs = set()
+        for index in self._indexes.values():
+            macs.update(index)
+        # New or removed devices, every column is realigned
+        if macs != self._rows.keys():
+            self.macs = sorted(macs)
+            self._rows = {mac: i for i, mac in enumerate(self.macs)}
+            changed = list(self._indexes)
+            for source in SOURCES:
+                for c, _ in _COLUMNS[source]:
+                    self.columns[c] = [None] * len(self.macs)
+
+        for source in changed:
+            index = self._indexes[source]
+            empty = (None,) * len(_COLUMNS[source])
+            values = [index.get(mac, empty) for mac in self.macs]
+            for i, (c, _) in enumerate(_COLUMNS[source]):
+                self.columns[c] = [v[i] for v in values]
+
+    async def _fetch(self, source: str) -> List[Dict[str, Any]]:
+        """Fetch the records of a source"""
+
+        if source == SOURCE_LAN:
+            interfaces = [i["name"] for i in await self._fbx.lan.get_interfaces() or []]
+            host_lists = await asyncio.gather(
+                *[self._fbx.lan.get_hosts_list(i) for i in interfaces]
+            )
+            return [
+                dict(h, interface=i)
+                for i, hosts in zip(interfaces, host_lists)
+                for h in hosts or []
+            ]
+        if source == SOURCE_DHCP_DYNAMIC:
+            return await self._fbx.dhcp.get_dhcp_dynamic_leases() or []
+        if source == SOURCE_DHCP_STATIC:
+            return await self._fbx.dhcp.get_dhcp_static_leases() or []
+
+        return await self._fbx.wifi.get_all_stations()
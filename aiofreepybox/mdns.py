@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import socket
+import struct
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_DEFAULT_TIMEOUT = 2.0
+_LOGGER = logging.getLogger(__name__)
+
+# mDNS group
+_MDNS_ADDR = "224.0.0.251"
+_MDNS_PORT = 5353
+
+# Record types
+_T_A = 1
+_T_PTR = 12
+_T_TXT = 16
+_T_SRV = 33
+_C_IN = 1
+
+# Freebox services
+FBX_API_SERVICE = "_fbx-api._tcp.local."
+FBX_PLAYER_SERVICES = (FBX_API_SERVICE, "_hid._udp.local.")
+
+
+class MdnsService:
+    """
+    A resolved DNS-SD service instance
+
+    name : `str`, instance name
+    service_type : `str`
+    target : `str`, SRV target host
+    port : `int`
+    address : `str`, IPv4 address of target, if advertised
+    txt : `dict`
+    ttl : `int`, smallest advertised TTL of the records
+    """
+
+    def __init__(
+        self,
+        name: str,
+        service_type: str,
+        target: str,
+        port: int,
+        address: Optional[str],
+        txt: Dict[str, str],
+        ttl: int,
+    ) -> None:
+        self.name = name
+        self.service_type = service_type
+        self.target = target
+        self.port = port
+        self.address = address
+        self.txt = txt
+        self.ttl = ttl
+
+    def __repr__(self) -> str:
+        return f"<MdnsService {self.name} {self.host}:{self.port}>"
+
+    @property
+    def host(self) -> str:
+        """Address if advertised, else target host."""
+        return self.address if self.address else self.target.rstrip(".")
+
+    @property
+    def device_type(self) -> str:
+        """Advertised freebox device type."""
+        return self.txt.get("device_type", "")
+
+    def fbx_desc(self) -> Dict[str, Any]:
+        """
+        Return the freebox description advertised in the TXT record,
+        typed as the ``api_version`` endpoint returns it
+        """
+
+        desc: Dict[str, Any] = dict(self.txt)
+        if "https_available" in desc:
+            desc["https_available"] = desc["https_available"] in ("1", "true")
+        if "https_port" in desc:
+            desc["https_port"] = int(desc["https_port"])
+        return desc
+
+
+class MdnsBrowser:
+    """
+    Minimal asyncio mDNS/DNS-SD browser
+
+    Records are cached with their advertised TTL, browsing a service type
+    with unexpired cached instances does not send any query.
+    """
+
+    def __init__(self) -> None:
+        self._ptr: Dict[str, Dict[str, float]] = {}
+        self._srv: Dict[str, Tuple[str, int, float]] = {}
+        self._txt: Dict[str, Tuple[Dict[str, str], float]] = {}
+        self._addr: Dict[str, Tuple[str, float]] = {}
+        self._names: Dict[str, str] = {}
+
+    async def browse(
+        self,
+        service_type: str,
+        timeout: float = _DEFAULT_TIMEOUT,
+        refresh: bool = False,
+    ) -> List[MdnsService]:
+        """
+        Browse instances of a service type
+
+        service_type : `str`, for example FBX_API_SERVICE
+        timeout : `float` , optional
+            , Default to _DEFAULT_TIMEOUT
+        refresh : `bool`, query the network even if instances are cached
+            , Default to False
+        """
+
+        service_type = service_type.lower()
+        if not refresh:
+            services = self.services(service_type)
+            if services:
+                return services
+
+        loop = asyncio.get_event_loop()
+        sock = self._open_socket()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _MdnsProtocol(self), sock=sock
+        )
+        try:
+            self._send(transport, [(service_type, _T_PTR)])
+            await asyncio.sleep(timeout / 2)
+            # Resolve instances whose SRV, TXT or A records were not sent along
+            questions = self._missing(service_type)
+            if questions:
+                self._send(transport, questions)
+            await asyncio.sleep(timeout / 2)
+        finally:
+            transport.close()
+
+        return self.services(service_type)
+
+    def services(self, service_type: str) -> List[MdnsService]:
+        """
+        Return cached resolved instances of a service type
+
+        service_type : `str`
+        """
+
+        now = asyncio.get_event_loop().time()
+        self._expire(now)
+        services = []
+        for inst, ptr_exp in self._ptr.get(service_type.lower(), {}).items():
+            if inst not in self._srv:
+                continue
+            target, port, srv_exp = self._srv[inst]
+            txt, txt_exp = self._txt.get(inst, ({}, ptr_exp))
+            address, addr_exp = self._addr.get(target, (None, srv_exp))
+            ttl = int(min(ptr_exp, srv_exp, txt_exp, addr_exp) - now)
+            services.append(
+                MdnsService(
+                    self._names.get(inst, inst),
+                    service_type.lower(),
+                    target,
+                    port,
+                    address,
+                    txt,
+                    ttl,
+                )
+            )
+        return services
+
+    def _expire(self, now: float) -> None:
+        """Drop expired records"""
+
+        for insts in self._ptr.values():
+            for inst in [i for i, exp in insts.items() if exp <= now]:
+                del insts[inst]
+        for d in (self._srv, self._txt, self._addr):
+            for k in [k for k, v in d.items() if v[-1] <= now]:  # type: ignore
+                del d[k]
+
+    def _missing(self, service_type: str) -> List[Tuple[str, int]]:
+        """Return the questions needed to resolve the instances of service_type"""
+
+        questions = []
+        for inst in self._ptr.get(service_type, {}):
+            if inst not in self._srv:
+                questions.append((inst, _T_SRV))
+            elif self._srv[inst][0] not in self._addr:
+                questions.append((self._srv[inst][0], _T_A))
+            if inst not in self._txt:
+                questions.append((inst, _T_TXT))
+        return questions
+
+    def _open_socket(self) -> socket.socket:
+        """
+        Open a socket on the mDNS port to receive multicast answers,
+        falls back to an ephemeral port receiving unicast answers
+        """
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            except OSError:
+                pass
+        try:
+            sock.bind(("", _MDNS_PORT))
+            sock.setsockopt(
+                socket.IPPROTO_IP,
+                socket.IP_ADD_MEMBERSHIP,
+                struct.pack("4s4s", socket.inet_aton(_MDNS_ADDR), bytes(4)),
+            )
+        except OSError:
+            _LOGGER.debug("mDNS port unavailable, using unicast answers")
+            sock.close()
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+            sock.bind(("", 0))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 255)
+        sock.setblocking(False)
+        return sock
+
+    def _send(self, transport: Any, questions: List[Tuple[str, int]]) -> None:
+        """Send a query"""
+
+        pkt = struct.pack(">HHHHHH", 0, 0, len(questions), 0, 0, 0)
+        for name, qtype in questions:
+            pkt += _pack_name(name) + struct.pack(">HH", qtype, _C_IN)
+        transport.sendto(pkt, (_MDNS_ADDR, _MDNS_PORT))
+
+    def _update(self, data: bytes) -> None:
+        """
+        Cache the records of a response
+
+        data : `bytes`
+        """
+
+        now = asyncio.get_event_loop().time()
+        flags, qdcount, ancount, nscount, arcount = struct.unpack_from(">2xHHHHH", data)
+        if not flags & 0x8000:
+            return
+        offset = 12
+        for _ in range(qdcount):
+            _, offset = _read_name(data, offset)
+            offset += 4
+        for _ in range(ancount + nscount + arcount):
+            name, offset = _read_name(data, offset)
+            rtype, _, ttl, rdlength = struct.unpack_from(">HHIH", data, offset)
+            offset += 10
+            rdata = offset
+            offset += rdlength
+            key = name.lower()
+            # TTL 0 is a goodbye, the record is expired now
+            exp = now + ttl
+
+            if rtype == _T_PTR:
+                inst, _ = _read_name(data, rdata)
+                self._ptr.setdefault(key, {})[inst.lower()] = exp
+                self._names[inst.lower()] = inst
+            elif rtype == _T_SRV:
+                port = struct.unpack_from(">H", data, rdata + 4)[0]
+                target, _ = _read_name(data, rdata + 6)
+                self._srv[key] = (target.lower(), port, exp)
+            elif rtype == _T_TXT:
+                self._txt[key] = (_read_txt(data[rdata:offset]), exp)
+            elif rtype == _T_A and rdlength == 4:
+                self._addr[key] = (socket.inet_ntoa(data[rdata:offset]), exp)
+
+
+class _MdnsProtocol(asyncio.DatagramProtocol):
+    """Feed received packets to a browser"""
+
+    def __init__(self, browser: MdnsBrowser) -> None:
+        self._browser = browser
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            self._browser._update(data)
+        except (struct.error, IndexError, ValueError) as e:
+            _LOGGER.debug(f"Invalid mDNS packet from {addr[0]}: {str(e)}")
+
+
+def _pack_name(name: str) -> bytes:
+    """Encode a domain name"""
+
+    out = b""
+    for label in name.rstrip(".").split("."):
+        b = label.encode("utf-8")
+        out += bytes([len(b)]) + b
+    return out + b"\x00"
+
+
+def _read_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """
+    Decode a possibly compressed domain name
+
+    Returns name, offset after the name
+    """
+
+    labels = []
+    end: Optional[int] = None
+    seen: Set[int] = set()
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            if offset in seen:
+                raise ValueError("name compression loop")
+            seen.add(offset)
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset : offset + length].decode("utf-8", "replace"))
+        offset += length
+    return ".".join(labels) + ".", end if end is not None else offset
+
+
+def _read_txt(rdata: bytes) -> Dict[str, str]:
+    """Decode TXT key=value strings"""
+
+    txt = {}
+    i = 0
+    while i < len(rdata):
+        length = rdata[i]
+        entry = rdata[i + 1 : i + 1 + length].decode("utf-8", "replace")
+        i += 1 + length
+        if entry:
+            k, _, v = entry.partition("=")
+            txt[k.lower()] = v
+    return txt
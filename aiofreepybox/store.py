@@ -0,0 +1,266 @@
+from abc import ABC, abstractmethod
+import base64
+import bz2
+import copy
+import json
+import os
+from os import fspath
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Store kinds
+STORE_CHANNELS = "channels"
+STORE_DB = "db"
+STORE_TOKEN = "token"
+
+# File prefixes by kind
+_F_NAMES = {
+    STORE_CHANNELS: ".fbx_channels",
+    STORE_DB: ".fbx_db",
+    STORE_TOKEN: ".fbx_app_auth",
+}
+
+# Sqlite schema
+_SQL_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS fbx_store ("
+    "kind TEXT NOT NULL, uid TEXT NOT NULL, data TEXT NOT NULL, "
+    "PRIMARY KEY (kind, uid)) WITHOUT ROWID"
+)
+
+
+class Store(ABC):
+    """
+    Base class of the token and freebox db storage backends
+
+    Entries are `dict` identified by a kind (``STORE_DB``, ``STORE_TOKEN``
+    or ``STORE_CHANNELS``) and a freebox uid. Methods are blocking,
+    Freepybox runs writes and the reads of ``open`` in its store executor,
+    ``clean_db``, ``get_db`` and discovery call them directly.
+    """
+
+    def close(self) -> None:
+        """
+        Release backend resources
+        """
+
+    @abstractmethod
+    def delete(self, kind: str, uid: str) -> bool:
+        """
+        Delete an entry
+
+        kind : `str`
+        uid : `str`
+
+        Returns `True` if the entry existed
+        """
+
+    @abstractmethod
+    def read(self, kind: str, uid: str) -> Optional[Dict[str, Any]]:
+        """
+        Read an entry
+
+        kind : `str`
+        uid : `str`
+
+        Returns `None` if the entry does not exist
+        """
+
+    @abstractmethod
+    def uids(self, kind: str) -> List[str]:
+        """
+        List stored uids
+
+        kind : `str`
+        """
+
+    @abstractmethod
+    def write(self, kind: str, uid: str, data: Dict[str, Any]) -> str:
+        """
+        Write an entry
+
+        kind : `str`
+        uid : `str`
+        data : `dict`
+
+        Returns the entry location
+        """
+
+
+class MemoryStore(Store):
+    """
+    In-memory store, nothing survives the process
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def delete(self, kind: str, uid: str) -> bool:
+        with self._lock:
+            return self._entries.pop((kind, uid), None) is not None
+
+    def read(self, kind: str, uid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            data = self._entries.get((kind, uid))
+        return json.loads(data) if data is not None else None
+
+    def uids(self, kind: str) -> List[str]:
+        with self._lock:
+            return [u for k, u in self._entries if k == kind]
+
+    def write(self, kind: str, uid: str, data: Dict[str, Any]) -> str:
+        with self._lock:
+            self._entries[(kind, uid)] = json.dumps(data)
+        return f"memory:{kind}/{uid}"
+
+
+class FileStore(Store):
+    """
+    Directory store, one bz2 compressed json file per entry named
+    ``<prefix>_<b64 uid>``
+
+    The directory is scanned once per kind and decoded entries are cached.
+    An entry missing from the index is still looked up on disk, since
+    another store may share the directory.
+
+    data_dir : `Path`
+    """
+
+    def __init__(self, data_dir: Path) -> None:
+        self.data_dir = Path(data_dir)
+        self._cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._index: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def delete(self, kind: str, uid: str) -> bool:
+        with self._lock:
+            self._cache.pop((kind, uid), None)
+            self._uid_index(kind).discard(uid)
+            try:
+                self._fname(kind, uid).unlink()
+            except FileNotFoundError:
+                return False
+        return True
+
+    def read(self, kind: str, uid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if (kind, uid) not in self._cache:
+                try:
+                    with bz2.open(self._fname(kind, uid), "rt", encoding="utf-8") as zf:
+                        self._cache[(kind, uid)] = json.load(zf)
+                except FileNotFoundError:
+                    self._uid_index(kind).discard(uid)
+                    return None
+                self._uid_index(kind).add(uid)
+            return copy.deepcopy(self._cache[(kind, uid)])
+
+    def uids(self, kind: str) -> List[str]:
+        with self._lock:
+            return list(self._uid_index(kind))
+
+    def write(self, kind: str, uid: str, data: Dict[str, Any]) -> str:
+        fname = self._fname(kind, uid)
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=fname.name + ".", dir=fspath(fname.parent)
+        )
+        # Write to a temporary file renamed over fname,
+        # readers never see a partially written file
+        try:
+            with os.fdopen(fd, "wb") as f, bz2.open(f, "wt", encoding="utf-8") as zf:
+                json.dump(data, zf)
+            os.replace(tmp_name, fspath(fname))
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+        with self._lock:
+            self._uid_index(kind).add(uid)
+            self._cache[(kind, uid)] = copy.deepcopy(data)
+        return fspath(fname)
+
+    def _fname(self, kind: str, uid: str) -> Path:
+        """
+        Return the file name of an entry
+
+        kind : `str`
+        uid : `str`
+        """
+        return self.data_dir.joinpath(
+            _F_NAMES[kind] + "_" + base64.b64encode(uid.encode("utf-8")).decode("utf-8")
+        )
+
+    def _uid_index(self, kind: str) -> Set[str]:
+        """
+        Return the uid index of kind, scanning the directory on first use
+
+        kind : `str`
+        """
+
+        if kind not in self._index:
+            prefix = _F_NAMES[kind] + "_"
+            uids: Set[str] = set()
+            try:
+                with os.scandir(fspath(self.data_dir)) as it:
+                    for e in it:
+                        # Skip temporary files, b64 names have no dot
+                        if e.name.startswith(prefix) and "." not in e.name[1:]:
+                            uids.add(
+                                base64.b64decode(e.name[len(prefix) :]).decode("utf-8")
+                            )
+            except FileNotFoundError:
+                pass
+            self._index[kind] = uids
+        return self._index[kind]
+
+
+class SqliteStore(Store):
+    """
+    Single file sqlite store, entries are looked up by their primary key
+
+    path : `str`, sqlite database path or ":memory:"
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(fspath(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(_SQL_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def delete(self, kind: str, uid: str) -> bool:
+        with self._lock, self._conn:
+            c = self._conn.execute(
+                "DELETE FROM fbx_store WHERE kind = ? AND uid = ?", (kind, uid)
+            )
+        return c.rowcount > 0
+
+    def read(self, kind: str, uid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM fbx_store WHERE kind = ? AND uid = ?", (kind, uid)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def uids(self, kind: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT uid FROM fbx_store WHERE kind = ?", (kind,)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def write(self, kind: str, uid: str, data: Dict[str, Any]) -> str:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fbx_store (kind, uid, data) VALUES (?, ?, ?)",
+                (kind, uid, json.dumps(data)),
+            )
+        return f"{self.path}:{kind}/{uid}"
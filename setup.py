@@ -4,6 +4,8 @@ import codecs
 import os
 import re
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py as _build_py
+from setuptools.command.sdist import sdist as _sdist
 
 
 # Method for retrieving the version is taken from the setup.py of pip itself:
@@ -25,6 +27,49 @@ def find_version(*file_paths):
     raise RuntimeError("Unable to find version string.")
 
 
+API_DIR = os.path.join(here, 'aiofreepybox', 'api')
+
+
+def api_registry():
+    mods = sorted(
+        n[:-3] for n in os.listdir(API_DIR)
+        if n.endswith('.py') and not n.startswith(('_', '.'))
+    )
+    lines = ['# Generated by setup.py, do not edit', '', 'API_MODULES = {']
+    lines += ['    "{0}": "{1}",'.format(n, n.capitalize()) for n in mods]
+    lines += ['}', '']
+    return '\n'.join(lines)
+
+
+def write_api_registry():
+    with open(os.path.join(API_DIR, '_registry.py'), 'w') as fp:
+        fp.write(api_registry())
+
+
+def check_api_registry():
+    if read('aiofreepybox', 'api', '_registry.py') != api_registry():
+        raise RuntimeError(
+            "aiofreepybox/api/_registry.py does not match the api modules, "
+            "run python setup.py build_py and commit it."
+        )
+
+
+class build_py(_build_py):
+    """Refresh the api modules registry before building"""
+
+    def run(self):
+        write_api_registry()
+        _build_py.run(self)
+
+
+class sdist(_sdist):
+    """Refuse to ship an outdated api modules registry"""
+
+    def run(self):
+        check_api_registry()
+        _sdist.run(self)
+
+
 # Get the long description from the README file
 with open(os.path.join(here, 'README.md'), encoding='utf-8') as f:
     long_description = f.read()
@@ -41,6 +86,7 @@ setup(
     long_description_content_type='text/markdown',
     install_requires=['aiohttp>=3,<4'],
     include_package_data=True,
+    cmdclass={'build_py': build_py, 'sdist': sdist},
     url='https://github.com/stilllman/aiofreepybox/tree/aiofreepybox',
     keywords='freebox async',
     classifiers=[